@@ -0,0 +1,160 @@
+"""
+Модуль асинхронного клиента API Кинопоиска.
+
+Запросы выполняются блокирующим KinopoiskApi в отдельном пуле потоков,
+поэтому асинхронный клиент использует тот же пул keep-alive соединений
+и не требует дополнительных HTTP-библиотек. Одинаковые одновременные запросы
+объединяются ещё до передачи в пул потоков (счётчики — в flight.stats()).
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+
+from api.kinopoisk_api import KinopoiskApi
+from api.single_flight import SingleFlight
+
+
+class AsyncKinopoiskApi:
+    """
+    Асинхронный клиент API Кинопоиска.
+
+    Помимо одиночных запросов умеет выполнять пакетный поиск и получение фильмов
+    с ограничением числа одновременных запросов. Результаты пакетных методов
+    возвращаются в порядке входных данных.
+    """
+
+    def __init__(self, base_url: str, api_key: str, concurrency: int = 10,
+                 timeout: float = 10, **options):
+        """
+        Инициализация клиента.
+
+        Аргументы:
+            base_url (str): Базовый URL для запросов к API Кинопоиска.
+            api_key (str): API-ключ для аутентификации запросов.
+            concurrency (int): Максимальное число одновременных запросов по умолчанию.
+            timeout (float): Таймаут одного запроса в секундах.
+            **options: Параметры синхронного клиента (кэш, пул соединений), см. KinopoiskApi.
+        """
+        options.setdefault("pool_maxsize", concurrency)
+        self.api = KinopoiskApi(base_url, api_key, timeout=timeout, **options)
+        self.concurrency = concurrency
+        self.flight = SingleFlight() if self.api.flight is not None else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="kinopoisk-api"
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Останавливает пул потоков и закрывает HTTP-сессию.
+        """
+        self._executor.shutdown(wait=True)
+        self.api.close()
+
+    async def _run(self, func, *args):
+        """
+        Выполняет блокирующий вызов клиента в пуле потоков.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _coalesced(self, key, func, *args):
+        """
+        Выполняет вызов в пуле потоков, объединяя его с одновременными вызовами с тем же ключом.
+        """
+        if self.flight is None:
+            return await self._run(func, *args)
+        return await self.flight.do_async(key, lambda: self._run(func, *args))
+
+    async def _gather(self, func, items, concurrency: int = None,
+                      return_exceptions: bool = False) -> list:
+        """
+        Выполняет func для каждого элемента items, не более concurrency одновременно.
+
+        Возвращает:
+            list: Результаты в порядке items.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(
+            *(run(item) for item in items), return_exceptions=return_exceptions
+        )
+
+    async def search_movie(self, query: str) -> dict:
+        """
+        Выполняет поиск фильма с помощью API Кинопоиска.
+
+        Аргументы:
+            query (str): Поисковый запрос для фильма.
+
+        Возвращает:
+            dict: Словарь с результатами поиска из API.
+
+        Исключения:
+            requests.RequestException: В случае ошибки при выполнении запроса к API.
+        """
+        return await self._coalesced(("search", query), self.api.search_movie, query)
+
+    async def get_movie(self, movie_id: int) -> dict:
+        """
+        Получает подробную информацию о фильме по его ID.
+
+        Аргументы:
+            movie_id (int): Идентификатор фильма на Кинопоиске.
+
+        Возвращает:
+            dict: Словарь с информацией о фильме.
+
+        Исключения:
+            requests.RequestException: В случае ошибки при выполнении запроса к API.
+        """
+        return await self._coalesced(("movie", movie_id), self.api.get_movie, movie_id)
+
+    async def search_many(self, queries, concurrency: int = None,
+                          return_exceptions: bool = False) -> list:
+        """
+        Выполняет поиск по каждому запросу с ограничением параллельности.
+
+        Аргументы:
+            queries (Iterable[str]): Поисковые запросы.
+            concurrency (int): Максимальное число одновременных запросов,
+                по умолчанию значение из конструктора.
+            return_exceptions (bool): Возвращать исключения на месте результатов
+                вместо прерывания всего пакета.
+
+        Возвращает:
+            list: Результаты поиска в порядке запросов.
+        """
+        queries = list(queries)
+        with allure.step(f"Пакетный поиск фильмов через API: {len(queries)} запросов"):
+            return await self._gather(self.search_movie, queries, concurrency, return_exceptions)
+
+    async def get_many(self, movie_ids, concurrency: int = None,
+                       return_exceptions: bool = False) -> list:
+        """
+        Получает информацию о каждом фильме с ограничением параллельности.
+
+        Аргументы:
+            movie_ids (Iterable[int]): Идентификаторы фильмов.
+            concurrency (int): Максимальное число одновременных запросов,
+                по умолчанию значение из конструктора.
+            return_exceptions (bool): Возвращать исключения на месте результатов
+                вместо прерывания всего пакета.
+
+        Возвращает:
+            list: Информация о фильмах в порядке идентификаторов.
+        """
+        movie_ids = list(movie_ids)
+        with allure.step(f"Пакетное получение фильмов через API: {len(movie_ids)} ID"):
+            return await self._gather(self.get_movie, movie_ids, concurrency, return_exceptions)
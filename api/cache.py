@@ -0,0 +1,267 @@
+"""
+Модуль кэша ответов API Кинопоиска.
+
+Кэш хранит тела ответов в памяти (LRU с ограничением времени жизни)
+и, по желанию, в файле SQLite, который переживает перезапуск pytest
+и общий для всех воркеров pytest-xdist.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    Закэшированный ответ API.
+    """
+
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, expires_at: float):
+        """
+        Аргументы:
+            body (bytes): Тело ответа.
+            etag (str): Значение заголовка ETag или None.
+            expires_at (float): Момент устаревания записи (time.time()).
+        """
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        """
+        True, если срок жизни записи ещё не истёк.
+        """
+        return time.time() < self.expires_at
+
+
+def cache_scope(base_url: str, api_key: str) -> str:
+    """
+    Строит область ключей кэша для сервера и ключа API.
+
+    Файл кэша общий для живого API, сервера-заглушки и разных ключей API,
+    поэтому ответы одного сервера или ключа не должны попадать к другому.
+    Сам ключ API в файл не записывается, только его хэш.
+
+    Аргументы:
+        base_url (str): Базовый URL API.
+        api_key (str): Ключ API.
+
+    Возвращает:
+        str: Префикс ключей кэша.
+    """
+    digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    return f"{base_url.rstrip('/')}#{digest}"
+
+
+def make_key(path: str, params: dict = None, scope: str = "") -> str:
+    """
+    Строит ключ кэша из области, пути запроса и его параметров.
+
+    Аргументы:
+        path (str): Путь относительно базового URL.
+        params (dict): Параметры строки запроса.
+        scope (str): Область ключей, см. cache_scope().
+
+    Возвращает:
+        str: Ключ, не зависящий от порядка параметров.
+    """
+    return scope + path + "?" + json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+
+
+def parse_cache_control(value: str) -> dict:
+    """
+    Разбирает заголовок Cache-Control в словарь директив.
+
+    Аргументы:
+        value (str): Значение заголовка.
+
+    Возвращает:
+        dict: Директивы в нижнем регистре; директивы без значения получают True.
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+class ResponseCache:
+    """
+    LRU-кэш ответов API с ограничением времени жизни записей.
+
+    Учитывает заголовки Cache-Control (no-store, no-cache, max-age) и ETag:
+    устаревшая запись с ETag не удаляется, а перепроверяется условным запросом.
+    Счётчики hits, misses, revalidations и stores доступны через stats().
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300, path: str = None):
+        """
+        Инициализация кэша.
+
+        Аргументы:
+            maxsize (int): Максимальное число записей в памяти.
+            ttl (float): Время жизни записи в секундах, если сервер не задал меньшее.
+            path (str): Путь к файлу SQLite для хранения между сессиями.
+                Если не указан, кэш живёт только в памяти.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(path) if path else None
+
+    @staticmethod
+    def _open_db(path: str) -> sqlite3.Connection:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB, etag TEXT, expires_at REAL)"
+        )
+        return db
+
+    def lookup(self, key: str):
+        """
+        Ищет запись по ключу в памяти, затем на диске.
+
+        Свежая запись засчитывается как попадание, устаревшая или отсутствующая — как промах.
+
+        Аргументы:
+            key (str): Ключ запроса, см. make_key().
+
+        Возвращает:
+            CacheEntry: Найденная запись (возможно, устаревшая) или None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT body, etag, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = CacheEntry(*row)
+                    self._remember(key, entry)
+            if entry is not None and not entry.fresh and not entry.etag:
+                self._forget(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def store(self, key: str, body: bytes, headers) -> None:
+        """
+        Сохраняет ответ, если заголовки это разрешают. Ответ с нулевым временем жизни
+        без ETag не сохраняется: использовать его повторно всё равно нельзя.
+
+        Аргументы:
+            key (str): Ключ запроса.
+            body (bytes): Тело ответа.
+            headers (Mapping): Заголовки ответа.
+        """
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            return
+        ttl = self._ttl_for(directives)
+        etag = headers.get("ETag")
+        if ttl <= 0 and not etag:
+            return
+        entry = CacheEntry(body, etag, time.time() + ttl)
+        with self._lock:
+            self._remember(key, entry)
+            self._persist(key, entry)
+            self.stores += 1
+
+    def revalidate(self, key: str, entry: CacheEntry, headers) -> None:
+        """
+        Продлевает запись после ответа 304 Not Modified.
+
+        Аргументы:
+            key (str): Ключ запроса.
+            entry (CacheEntry): Запись, полученная из lookup().
+            headers (Mapping): Заголовки ответа 304.
+        """
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        with self._lock:
+            self._remember(key, entry)
+            entry.expires_at = time.time() + self._ttl_for(directives)
+            entry.etag = headers.get("ETag", entry.etag)
+            self._persist(key, entry)
+            self.revalidations += 1
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи из памяти и с диска.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """
+        Закрывает файл SQLite.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики работы кэша.
+
+        Возвращает:
+            dict: hits, misses, revalidations, stores и текущее число записей в памяти.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stores": self.stores,
+            "size": len(self._entries),
+        }
+
+    def _ttl_for(self, directives: dict) -> float:
+        if "no-cache" in directives:
+            return 0
+        max_age = directives.get("max-age")
+        if isinstance(max_age, str) and max_age.isdigit():
+            return min(self.ttl, int(max_age))
+        return self.ttl
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _persist(self, key: str, entry: CacheEntry) -> None:
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, expires_at) VALUES (?, ?, ?, ?)",
+                (key, entry.body, entry.etag, entry.expires_at),
+            )
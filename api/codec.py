@@ -0,0 +1,82 @@
+"""
+Модуль разбора JSON-ответов API Кинопоиска.
+
+Если установлен orjson или msgspec, тело ответа разбирается им, иначе стандартным json.
+Функция project() оставляет в документе только нужные поля.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    DECODER = "orjson"
+elif msgspec is not None:
+    DECODER = "msgspec"
+else:
+    DECODER = "json"
+
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+
+
+def loads(data):
+    """
+    Разбирает JSON самым быстрым из доступных декодеров.
+
+    Аргументы:
+        data (bytes | str): Тело ответа.
+
+    Возвращает:
+        Разобранное значение.
+
+    Исключения:
+        ValueError: Если данные не являются корректным JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if _msgspec_decoder is not None:
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def project(doc: dict, fields) -> dict:
+    """
+    Оставляет в документе только перечисленные поля.
+
+    Вложенные поля задаются через точку, например "rating.kp"; для списков
+    словарей проекция применяется к каждому элементу ("persons.name").
+
+    Аргументы:
+        doc (dict): Документ фильма.
+        fields (Iterable[str]): Нужные поля.
+
+    Возвращает:
+        dict: Новый документ только с нужными полями; отсутствующие поля пропускаются.
+    """
+    tree = {}
+    for field in fields:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+    return _project(doc, tree)
+
+
+def _project(value, tree: dict):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
@@ -2,62 +2,323 @@
 Модуль для взаимодействия с API Кинопоиска.
 """
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import allure
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from api.cache import ResponseCache, cache_scope, make_key
+from api.codec import loads, project
+from api.models import Movie
+from api.rate_limit import RateLimiter, RetryPolicy
+from api.single_flight import SingleFlight
+
+
+# Поля ответа, из которых строится Movie.
+MOVIE_FIELDS = ("id", "name", "alternativeName", "enName", "year", "type",
+                "rating.kp", "rating.imdb", "movieLength", "poster.url")
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTP-адаптер, который перед каждой отправкой запроса ждёт разрешения ограничителя
+    и повторяет GET-запросы по расписанию RetryPolicy при ответах 429 и 5xx.
+
+    Каждый повтор тоже проходит через ограничитель, а пауза из Retry-After ответа 429
+    передаётся ограничителю, чтобы её выдержали все потоки и процессы, делящие лимит.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                 **kwargs):
+        """
+        Аргументы:
+            rate_limiter (RateLimiter): Ограничитель частоты; None — без ограничения.
+            retry_policy (RetryPolicy): Расписание повторов; None — без повторов по статусу.
+            **kwargs: Параметры HTTPAdapter.
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.retries = 0
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = super().send(request, **kwargs)
+            if (self.retry_policy is None or request.method not in ("GET", "HEAD")
+                    or not self.retry_policy.should_retry(response.status_code, attempt)):
+                return response
+            delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+            if response.status_code == 429 and self.rate_limiter is not None:
+                self.rate_limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+            response.close()
+            attempt += 1
+            self.retries += 1
+
+
+def create_session(
+    api_key: str = None,
+    pool_connections: int = 4,
+    pool_maxsize: int = 10,
+    pool_block: bool = False,
+    max_retries: int = 0,
+    backoff_factor: float = 0.3,
+    max_backoff: float = 30,
+    keep_alive: bool = True,
+    rate_limiter: RateLimiter = None,
+) -> requests.Session:
+    """
+    Создаёт HTTP-сессию с пулом соединений для запросов к API.
+
+    Аргументы:
+        api_key (str): API-ключ, добавляемый в заголовки всех запросов сессии.
+        pool_connections (int): Количество хостов, для которых хранится пул соединений.
+        pool_maxsize (int): Максимальное число соединений к одному хосту.
+        pool_block (bool): Ждать свободное соединение вместо открытия лишнего,
+            если лимит соединений к хосту исчерпан.
+        max_retries (int): Количество повторов при сетевых ошибках и ответах 429/502/503/504.
+        backoff_factor (float): Пауза перед первым повтором; далее удваивается,
+            фактическая пауза выбирается случайно от нуля до этого значения.
+        max_backoff (float): Верхняя граница паузы, в том числе заданной в Retry-After.
+        keep_alive (bool): Переиспользовать соединения между запросами.
+        rate_limiter (RateLimiter): Ограничитель частоты запросов сессии.
+
+    Возвращает:
+        requests.Session: Настроенная сессия.
+    """
+    # Сетевые ошибки повторяет urllib3, ответы с ошибочным статусом — RateLimitedAdapter.
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_max=max_backoff,
+        status_forcelist=(),
+        respect_retry_after_header=False,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = RateLimitedAdapter(
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(max_retries, backoff_factor, max_backoff) if max_retries else None,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if api_key:
+        session.headers["X-API-KEY"] = api_key
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
 
 class KinopoiskApi:
     """
     Позволяет выполнять поиск фильмов по названию и получать
     детальную информацию о фильме через HTTP-запросы с использованием ключа API.
+
+    Все запросы идут через собственную сессию с пулом keep-alive соединений.
+    Сессию нужно закрыть методом close() или использовать клиент как контекстный менеджер.
+    При переданном кэше повторные запросы с теми же параметрами обслуживаются из него.
+    Одинаковые запросы, выполняемые одновременно из разных потоков, объединяются
+    в один HTTP-запрос (счётчики — в flight.stats()); общий результат изменять нельзя.
+    Ответы разбираются быстрым декодером (см. api.codec), если он установлен.
     """
 
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, timeout: float = 10,
+                 cache: ResponseCache = None, coalesce: bool = True, **session_options):
         """
         Инициализация класса.
 
         Аргументы:
             base_url (str): Базовый URL для запросов к API Кинопоиска.
             api_key (str): API-ключ для аутентификации запросов.
+            timeout (float): Таймаут одного запроса в секундах.
+            cache (ResponseCache): Кэш ответов; по умолчанию кэширование выключено.
+            coalesce (bool): Объединять одновременные одинаковые запросы в один.
+            **session_options: Параметры пула соединений, см. create_session().
         """
-        self.base_url = base_url
+        self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+        self._cache_scope = cache_scope(self.base_url, api_key)
+        self.session = create_session(api_key, **session_options)
+        self.flight = SingleFlight() if coalesce else None
+        self._prefetch = None
 
-    @allure.step("Поиск фильма через API по запросу: {query}")
-    def search_movie(self, query: str) -> dict:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
         """
-        Выполняет поиск фильма с помощью API Кинопоиска.
+        Закрывает сессию, все соединения пула, поток предзагрузки страниц и файл кэша.
+        """
+        if self._prefetch is not None:
+            self._prefetch.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _get(self, path: str, params: dict = None) -> dict:
+        """
+        Выполняет GET-запрос к API и возвращает разобранный JSON.
 
         Аргументы:
-            query (str): Поисковый запрос для фильма.
+            path (str): Путь относительно базового URL.
+            params (dict): Параметры строки запроса.
 
         Возвращает:
-            dict: Словарь с результатами поиска из API.
+            dict: Тело ответа.
 
         Исключения:
-            requests.RequestException: В случае возникновения ошибки при выполнении запроса к API.
+            requests.RequestException: В случае ошибки при выполнении запроса к API;
+                некорректное тело ответа — requests.JSONDecodeError.
         """
-        headers = {"X-API-KEY": self.api_key}
-        params = {"query": query}
+        if self.flight is None:
+            return self._fetch(path, params)
+        return self.flight.do(make_key(path, params), lambda: self._fetch(path, params))
+
+    def _fetch(self, path: str, params: dict = None) -> dict:
+        if self.cache is None:
+            entry = None
+        else:
+            key = make_key(path, params, self._cache_scope)
+            entry = self.cache.lookup(key)
+            if entry is not None and entry.fresh:
+                return _decode(entry.body)
+        headers = {"If-None-Match": entry.etag} if entry is not None else None
         try:
-            response = requests.get(
-                f"{self.base_url}/movie/search",
+            response = self.session.get(
+                f"{self.base_url}{path}",
                 params=params,
                 headers=headers,
-                timeout=10
+                timeout=self.timeout
             )
+            if response.status_code == 304 and entry is not None:
+                self.cache.revalidate(key, entry, response.headers)
+                return _decode(entry.body)
             response.raise_for_status()
-            return response.json()
+            if self.cache is not None:
+                self.cache.store(key, response.content, response.headers)
+            return _decode(response.content)
         except requests.RequestException as e:
             allure.attach(str(e), name="Ошибка API", attachment_type=allure.attachment_type.TEXT)
             raise
 
+    @allure.step("Поиск фильма через API по запросу: {query}")
+    def search_movie(self, query: str, page: int = None, limit: int = None,
+                     fields=None) -> dict:
+        """
+        Выполняет поиск фильма с помощью API Кинопоиска.
+
+        Аргументы:
+            query (str): Поисковый запрос для фильма.
+            page (int): Номер страницы результатов, начиная с 1; по умолчанию первая.
+            limit (int): Количество фильмов на странице; по умолчанию как у API.
+            fields (Iterable[str]): Нужные поля фильмов, например ("id", "name", "rating.kp").
+                Отбираются на клиенте: /movie/search не поддерживает selectFields;
+                по умолчанию возвращаются все поля.
+
+        Возвращает:
+            dict: Словарь с результатами поиска из API.
+
+        Исключения:
+            requests.RequestException: В случае возникновения ошибки при выполнении запроса к API.
+        """
+        params = {"query": query}
+        if page is not None:
+            params["page"] = page
+        if limit is not None:
+            params["limit"] = limit
+        data = self._get("/movie/search", params=params)
+        if fields:
+            data = dict(data, docs=[project(doc, fields) for doc in data.get("docs") or []])
+        return data
+
+    def search_movie_records(self, query: str, page: int = None, limit: int = None) -> list:
+        """
+        Выполняет поиск и возвращает найденные фильмы в виде записей Movie.
+
+        В записях остаются только поля, которые хранит Movie.
+
+        Аргументы:
+            query (str): Поисковый запрос для фильма.
+            page (int): Номер страницы результатов.
+            limit (int): Количество фильмов на странице.
+
+        Возвращает:
+            list[Movie]: Найденные фильмы.
+        """
+        return Movie.list_from(self.search_movie(query, page, limit, fields=MOVIE_FIELDS))
+
+    def iter_search(self, query: str, page_size: int = 50, max_items: int = None, fields=None):
+        """
+        Перебирает все найденные фильмы постранично, по одному документу.
+
+        Страницы запрашиваются лениво: пока вызывающий код обрабатывает текущую
+        страницу, следующая загружается в фоновом потоке. В памяти одновременно
+        находятся не более двух страниц.
+
+        Аргументы:
+            query (str): Поисковый запрос для фильма.
+            page_size (int): Количество фильмов на одной странице запроса.
+            max_items (int): Максимальное число возвращаемых фильмов; None — все.
+            fields (Iterable[str]): Нужные поля фильмов, см. search_movie().
+
+        Возвращает:
+            Iterator[dict]: Документы фильмов из поля docs ответов.
+
+        Исключения:
+            requests.RequestException: В случае ошибки при загрузке очередной страницы.
+        """
+        if self._prefetch is None:
+            self._prefetch = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix="kinopoisk-prefetch")
+        page = 1
+        yielded = 0
+        future = self._prefetch.submit(self.search_movie, query, page, page_size, fields)
+        try:
+            while future is not None:
+                data = future.result()
+                docs = data.get("docs") or []
+                pages = data.get("pages")
+                has_next = bool(docs) and (page < pages if pages else len(docs) >= page_size)
+                if max_items is not None and yielded + len(docs) >= max_items:
+                    has_next = False
+                page += 1
+                future = (self._prefetch.submit(self.search_movie, query, page, page_size, fields)
+                          if has_next else None)
+                for doc in docs:
+                    if max_items is not None and yielded >= max_items:
+                        return
+                    yielded += 1
+                    yield doc
+        finally:
+            if future is not None:
+                future.cancel()
+
     @allure.step("Получение информации о фильме с ID: {movie_id}")
-    def get_movie(self, movie_id: int) -> dict:
+    def get_movie(self, movie_id: int, fields=None) -> dict:
         """
         Получает подробную информацию о фильме по его ID.
 
         Аргументы:
             movie_id (int): Идентификатор фильма на Кинопоиске.
+            fields (Iterable[str]): Нужные поля фильма, см. search_movie().
 
         Возвращает:
             dict: Словарь с информацией о фильме.
@@ -65,15 +326,31 @@ class KinopoiskApi:
         Исключения:
             requests.RequestException: В случае ошибки при выполнении запроса к API.
         """
-        headers = {"X-API-KEY": self.api_key}
-        try:
-            response = requests.get(
-                f"{self.base_url}/movie/{movie_id}",
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            allure.attach(str(e), name="Ошибка API", attachment_type=allure.attachment_type.TEXT)
-            raise
+        data = self._get(f"/movie/{movie_id}")
+        return project(data, fields) if fields else data
+
+    def get_movie_record(self, movie_id: int) -> Movie:
+        """
+        Получает фильм по его ID в виде записи Movie.
+
+        Аргументы:
+            movie_id (int): Идентификатор фильма на Кинопоиске.
+
+        Возвращает:
+            Movie: Запись о фильме.
+        """
+        return Movie.from_doc(self.get_movie(movie_id, fields=MOVIE_FIELDS))
+
+
+def _decode(body):
+    """
+    Разбирает тело ответа. Ошибка разбора возбуждается как requests.JSONDecodeError,
+    чтобы обрабатываться вместе с остальными ошибками запроса, как у response.json().
+    """
+    try:
+        return loads(body)
+    except ValueError as e:
+        if isinstance(e, json.JSONDecodeError):
+            raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+        text = body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+        raise requests.JSONDecodeError(str(e), text, 0) from e
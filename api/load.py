@@ -0,0 +1,423 @@
+"""
+Модуль нагрузочного прогона клиента API Кинопоиска.
+
+Запросы /movie/search и /movie/{id} выполняются через KinopoiskApi с заданной
+конкурентностью (замкнутая модель: каждый поток отправляет следующий запрос после ответа)
+или с заданной частотой RPS (открытая модель: запросы планируются по расписанию,
+а задержка считается от запланированного момента, чтобы очередь на стороне клиента
+не скрывала медленные ответы). Запросы берутся из config/test_data.json.
+
+Результат содержит пропускную способность, гистограммы задержек в стиле HdrHistogram,
+число ошибок по HTTP-статусам и число ответов 429. Прогон против локального
+сервера-заглушки (--target=stub) показывает накладные расходы самого клиента.
+
+Запуск:
+    python -m api.load --target=stub --concurrency=8 --duration=10
+    python -m api.load --target=live --rps=5 --duration=30 --json=load.json
+"""
+
+import argparse
+import configparser
+import json
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+
+from api.kinopoisk_api import KinopoiskApi
+
+SEARCH_DATA_KEYS = ("search_exact", "search_partial", "search_en", "search_fake", "search_invalid")
+RATE_LIMIT_STATUS = 429
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмически-линейными корзинами, как в HdrHistogram:
+    относительная погрешность не больше 1/128 во всём диапазоне значений.
+    Значения хранятся в микросекундах.
+    """
+
+    SUB_BUCKET_BITS = 8
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        shift = max(value_us.bit_length() - self.SUB_BUCKET_BITS, 0)
+        return (shift << self.SUB_BUCKET_BITS) + (value_us >> shift)
+
+    def _highest_value(self, index: int) -> int:
+        shift, mantissa = divmod(index, 1 << self.SUB_BUCKET_BITS)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        """
+        Добавляет замер.
+
+        Аргументы:
+            seconds (float): Задержка в секундах.
+        """
+        value_us = max(int(seconds * 1_000_000), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum_us += value_us
+        self.max_us = max(self.max_us, value_us)
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Добавляет замеры другой гистограммы.
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, q: float) -> float:
+        """
+        Возвращает перцентиль задержки в миллисекундах (верхнюю границу корзины).
+
+        Аргументы:
+            q (float): Перцентиль от 0 до 100.
+        """
+        if not self.total:
+            return 0.0
+        threshold = max(q / 100 * self.total, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(self._highest_value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает сводку и перцентильное распределение задержек в миллисекундах.
+        """
+        return {
+            "count": self.total,
+            "min_ms": (self.min_us or 0) / 1000,
+            "mean_ms": round(self.sum_us / self.total / 1000, 3) if self.total else 0.0,
+            "max_ms": self.max_us / 1000,
+            "percentiles_ms": {
+                str(q): self.percentile(q) for q in (50, 75, 90, 95, 99, 99.9, 99.99)
+            },
+        }
+
+
+class LoadResult:
+    """
+    Итоги нагрузочного прогона.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = {}
+        self.rate_limited = 0
+        self.elapsed = 0.0
+        self.histograms = {}
+
+    def record(self, endpoint: str, seconds: float, status):
+        """
+        Добавляет результат одного запроса.
+
+        Аргументы:
+            endpoint (str): Название операции: search или movie.
+            seconds (float): Задержка запроса.
+            status: HTTP-статус ошибки, название исключения или None для успешного ответа.
+        """
+        self.requests += 1
+        self.histograms.setdefault(endpoint, LatencyHistogram()).record(seconds)
+        if status is not None:
+            self.errors[str(status)] = self.errors.get(str(status), 0) + 1
+            if status == RATE_LIMIT_STATUS:
+                self.rate_limited += 1
+
+    def merge(self, other: "LoadResult"):
+        """
+        Добавляет результаты другого потока.
+        """
+        self.requests += other.requests
+        self.rate_limited += other.rate_limited
+        for status, count in other.errors.items():
+            self.errors[status] = self.errors.get(status, 0) + count
+        for endpoint, histogram in other.histograms.items():
+            self.histograms.setdefault(endpoint, LatencyHistogram()).merge(histogram)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Число выполненных запросов в секунду.
+        """
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Доля запросов, завершившихся ошибкой.
+        """
+        return sum(self.errors.values()) / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict:
+        overall = LatencyHistogram()
+        for histogram in self.histograms.values():
+            overall.merge(histogram)
+        return {
+            "requests": self.requests,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "errors": dict(sorted(self.errors.items())),
+            "rate_limited": self.rate_limited,
+            "latency": overall.to_dict(),
+            "endpoints": {name: histogram.to_dict()
+                          for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def format(self) -> str:
+        """
+        Возвращает сводку в текстовом виде.
+        """
+        data = self.to_dict()
+        lines = [
+            f"Запросов: {data['requests']} за {data['elapsed_s']} с, "
+            f"{data['throughput_rps']} запросов/с",
+            f"Ошибки: {data['errors'] or 'нет'}, доля {data['error_rate']:.2%}, "
+            f"ответов 429: {data['rate_limited']}",
+        ]
+        for name, histogram in [("всего", data["latency"])] + list(data["endpoints"].items()):
+            percentiles = ", ".join(f"p{q}={value:.2f}"
+                                    for q, value in histogram["percentiles_ms"].items())
+            lines.append(f"{name}: {percentiles}, max={histogram['max_ms']:.2f} мс")
+        return "\n".join(lines)
+
+
+class QueryMix:
+    """
+    Набор запросов для нагрузки: поисковые строки и идентификаторы фильмов.
+    """
+
+    def __init__(self, queries, movie_ids=(), search_ratio: float = 0.7, seed: int = None):
+        """
+        Аргументы:
+            queries (Iterable[str]): Поисковые запросы.
+            movie_ids (Iterable[int]): Идентификаторы фильмов для /movie/{id}.
+            search_ratio (float): Доля поисковых запросов, если заданы идентификаторы.
+            seed (int): Зерно генератора для воспроизводимой последовательности.
+        """
+        self.queries = [query for query in queries if query]
+        self.movie_ids = list(movie_ids)
+        if not self.queries and not self.movie_ids:
+            raise ValueError("Для нагрузки нужен хотя бы один запрос или идентификатор фильма")
+        self.search_ratio = search_ratio
+        self.seed = seed
+
+    @classmethod
+    def from_test_data(cls, test_data: dict, movie_ids=(), **kwargs) -> "QueryMix":
+        """
+        Собирает набор из поисковых запросов тестовых данных.
+        """
+        return cls([test_data.get(key) for key in SEARCH_DATA_KEYS], movie_ids, **kwargs)
+
+    def sequence(self, worker: int):
+        """
+        Бесконечная последовательность операций (endpoint, аргумент) для потока.
+        """
+        rng = random.Random(None if self.seed is None else self.seed + worker)
+        search_ratio = self.search_ratio if self.movie_ids else 1.0
+        if not self.queries:
+            search_ratio = 0.0
+        while True:
+            if rng.random() < search_ratio:
+                yield "search", rng.choice(self.queries)
+            else:
+                yield "movie", rng.choice(self.movie_ids)
+
+
+def discover_movie_ids(api: KinopoiskApi, queries, limit: int = 20) -> list:
+    """
+    Находит идентификаторы фильмов поиском по запросам, чтобы нагружать /movie/{id}.
+    """
+    ids = []
+    for query in queries:
+        try:
+            docs = api.search_movie(query).get("docs", [])
+        except requests.RequestException:
+            continue
+        ids.extend(doc["id"] for doc in docs if doc.get("id") and doc["id"] not in ids)
+        if len(ids) >= limit:
+            break
+    return ids[:limit]
+
+
+def _call(api: KinopoiskApi, endpoint: str, argument):
+    if endpoint == "search":
+        return api.search_movie(argument)
+    return api.get_movie(argument)
+
+
+def run_load(api: KinopoiskApi, mix: QueryMix, duration: float, concurrency: int = 8,
+             rps: float = None) -> LoadResult:
+    """
+    Выполняет нагрузочный прогон.
+
+    Аргументы:
+        api (KinopoiskApi): Клиент API; размер пула соединений должен быть не меньше concurrency.
+            Клиент создаётся с coalesce=False: объединённые одновременные запросы
+            не доходят до сервера, и счётчик запросов с задержками был бы завышен.
+        mix (QueryMix): Набор запросов.
+        duration (float): Длительность прогона в секундах.
+        concurrency (int): Число потоков, отправляющих запросы.
+        rps (float): Целевая частота запросов; None — потоки работают без пауз.
+
+    Возвращает:
+        LoadResult: Итоги прогона.
+    """
+    started = time.perf_counter()
+    deadline = started + duration
+    slot = [0]
+    slot_lock = threading.Lock()
+    results = [LoadResult() for _ in range(concurrency)]
+
+    def next_start():
+        if rps is None:
+            now = time.perf_counter()
+            return now if now < deadline else None
+        with slot_lock:
+            scheduled = started + slot[0] / rps
+            slot[0] += 1
+        if scheduled >= deadline:
+            return None
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return scheduled
+
+    def worker(number: int):
+        result = results[number]
+        for endpoint, argument in mix.sequence(number):
+            scheduled = next_start()
+            if scheduled is None:
+                return
+            status = None
+            try:
+                _call(api, endpoint, argument)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else type(e).__name__
+            except requests.RequestException as e:
+                status = type(e).__name__
+            result.record(endpoint, time.perf_counter() - scheduled, status)
+
+    threads = [threading.Thread(target=worker, args=(number,), daemon=True)
+               for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = LoadResult()
+    for result in results:
+        total.merge(result)
+    total.elapsed = time.perf_counter() - started
+    return total
+
+
+def build_stub_cassette(mix: QueryMix, cassette=None):
+    """
+    Дополняет кассету синтетическими ответами на все запросы набора,
+    чтобы сервер-заглушка отвечал 200 без записанных обменов.
+
+    Аргументы:
+        mix (QueryMix): Набор запросов.
+        cassette (Cassette): Кассета для дополнения; по умолчанию новая в памяти.
+
+    Возвращает:
+        Cassette: Кассета с ответами на все запросы набора.
+    """
+    from stubs.cassette import Cassette
+
+    cassette = cassette or Cassette(None)
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    movie_ids = mix.movie_ids or list(range(1, len(mix.queries) + 1))
+    for number, query in enumerate(mix.queries):
+        if cassette.find("/movie/search", urlencode({"query": query}), True) is None:
+            docs = [{"id": movie_ids[number % len(movie_ids)], "name": query}]
+            cassette.add("/movie/search", urlencode({"query": query}), True, 200, headers,
+                         json.dumps({"docs": docs, "total": 1}, ensure_ascii=False))
+    for movie_id in movie_ids:
+        if cassette.find(f"/movie/{movie_id}", "", True) is None:
+            cassette.add(f"/movie/{movie_id}", "", True, 200, headers,
+                         json.dumps({"id": movie_id, "name": f"Фильм {movie_id}"},
+                                    ensure_ascii=False))
+    return cassette
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон клиента API Кинопоиска.")
+    parser.add_argument("--target", choices=("stub", "live"), default="stub",
+                        help="stub — локальный сервер-заглушка; live — API из config.ini.")
+    parser.add_argument("--duration", type=float, default=10, help="Длительность, с.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Число потоков.")
+    parser.add_argument("--rps", type=float, default=None, help="Целевая частота запросов.")
+    parser.add_argument("--search-ratio", type=float, default=0.7,
+                        help="Доля запросов /movie/search.")
+    parser.add_argument("--seed", type=int, default=None, help="Зерно последовательности.")
+    parser.add_argument("--cassette", default=None,
+                        help="Кассета для сервера-заглушки; без неё ответы синтетические.")
+    parser.add_argument("--latency-ms", type=float, default=0,
+                        help="Задержка ответов сервера-заглушки, мс.")
+    parser.add_argument("--json", default=None, help="Файл для отчёта в формате JSON.")
+    parser.add_argument("--config", default="config/config.ini")
+    parser.add_argument("--test-data", default="config/test_data.json")
+    args = parser.parse_args(argv)
+
+    config = configparser.ConfigParser()
+    config.read(args.config)
+    with open(args.test_data, encoding="utf-8") as f:
+        test_data = json.load(f)
+    section = config["api"]
+    options = {
+        "timeout": section.getfloat("timeout", 10),
+        "pool_maxsize": max(section.getint("pool_maxsize", 10), args.concurrency),
+        "pool_block": True,
+        "coalesce": False,
+    }
+    mix = QueryMix.from_test_data(test_data, search_ratio=args.search_ratio, seed=args.seed)
+
+    server = None
+    base_url = section["base_url"]
+    if args.target == "stub":
+        from stubs.api_server import FaultProfile, StubApiServer
+        from stubs.cassette import Cassette
+
+        cassette = Cassette.load(args.cassette) if args.cassette else None
+        server = StubApiServer(build_stub_cassette(mix, cassette),
+                               FaultProfile(latency_ms=args.latency_ms)).start()
+        base_url = server.url
+    try:
+        with KinopoiskApi(base_url, test_data.get("api_key", ""), **options) as api:
+            mix.movie_ids = discover_movie_ids(api, mix.queries)
+            result = run_load(api, mix, args.duration, args.concurrency, args.rps)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(result.format())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
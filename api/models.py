@@ -0,0 +1,76 @@
+"""
+Модуль лёгких типизированных записей для ответов API Кинопоиска.
+"""
+
+
+class Movie:
+    """
+    Краткая запись о фильме из ответа /movie/search или /movie/{id}.
+
+    Хранит только основные поля и не держит в памяти исходный документ.
+    """
+
+    __slots__ = ("id", "name", "alternative_name", "en_name", "year", "type",
+                 "rating_kp", "rating_imdb", "length", "poster_url")
+
+    def __init__(self, id: int, name: str = None, alternative_name: str = None,
+                 en_name: str = None, year: int = None, type: str = None,
+                 rating_kp: float = None, rating_imdb: float = None,
+                 length: int = None, poster_url: str = None):
+        self.id = id
+        self.name = name
+        self.alternative_name = alternative_name
+        self.en_name = en_name
+        self.year = year
+        self.type = type
+        self.rating_kp = rating_kp
+        self.rating_imdb = rating_imdb
+        self.length = length
+        self.poster_url = poster_url
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "Movie":
+        """
+        Создаёт запись из документа API.
+
+        Аргументы:
+            doc (dict): Документ фильма.
+
+        Возвращает:
+            Movie: Запись о фильме.
+        """
+        rating = doc.get("rating") or {}
+        poster = doc.get("poster") or {}
+        return cls(
+            id=doc.get("id"),
+            name=doc.get("name"),
+            alternative_name=doc.get("alternativeName"),
+            en_name=doc.get("enName"),
+            year=doc.get("year"),
+            type=doc.get("type"),
+            rating_kp=rating.get("kp"),
+            rating_imdb=rating.get("imdb"),
+            length=doc.get("movieLength"),
+            poster_url=poster.get("url"),
+        )
+
+    @classmethod
+    def list_from(cls, data: dict) -> list:
+        """
+        Создаёт записи из поля docs ответа поиска.
+
+        Аргументы:
+            data (dict): Ответ /movie/search.
+
+        Возвращает:
+            list[Movie]: Записи о найденных фильмах.
+        """
+        return [cls.from_doc(doc) for doc in data.get("docs") or []]
+
+    def __eq__(self, other):
+        if not isinstance(other, Movie):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"Movie(id={self.id!r}, name={self.name!r}, year={self.year!r})"
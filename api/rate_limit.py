@@ -0,0 +1,150 @@
+"""
+Модуль ограничения частоты запросов к API Кинопоиска и расписания повторов.
+
+Лимит может быть общим для всех процессов: состояние хранится в файле
+под межпроцессной блокировкой, поэтому воркеры pytest-xdist делят один бюджет.
+После ответа 429 пауза из Retry-After применяется ко всем, кто делит ограничитель.
+"""
+
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from utils.file_lock import file_lock
+
+
+class RateLimiter:
+    """
+    Ограничитель по алгоритму «маркерной корзины»: в среднем не чаще rate запросов
+    в секунду, при этом до burst запросов могут уйти подряд после простоя.
+
+    Состояние хранится как теоретическое время следующего запроса (GCRA),
+    поэтому для общего лимита между процессами достаточно одного числа в файле.
+    """
+
+    def __init__(self, rate: float, state_file: str = None, burst: int = 1):
+        """
+        Инициализация ограничителя.
+
+        Аргументы:
+            rate (float): Допустимое число запросов в секунду.
+            state_file (str): Файл общего состояния для нескольких процессов.
+                Если не указан, лимит действует только внутри процесса.
+            burst (int): Ёмкость корзины — сколько запросов можно отправить без пауз.
+        """
+        self.rate = rate
+        self.interval = 1 / rate
+        self.burst = max(int(burst), 1)
+        self.state_file = state_file
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Ждёт, пока в корзине не появится маркер для очередного запроса.
+        """
+        now = time.time()
+        allowed_at = self._update(lambda slot: max(slot, now) + self.interval) \
+            - self.burst * self.interval
+        if allowed_at > now:
+            time.sleep(allowed_at - now)
+
+    def penalize(self, delay: float):
+        """
+        Откладывает все следующие запросы минимум на delay секунд,
+        например после ответа 429 с заголовком Retry-After.
+
+        Аргументы:
+            delay (float): Пауза в секундах.
+        """
+        resume_at = time.time() + delay + (self.burst - 1) * self.interval
+        self._update(lambda slot: max(slot, resume_at))
+
+    def _update(self, change) -> float:
+        with self._lock:
+            if self.state_file:
+                with file_lock(self.state_file + ".lock"):
+                    slot = change(self._read_next_slot())
+                    self._write_next_slot(slot)
+            else:
+                slot = self._next_slot = change(self._next_slot)
+        return slot
+
+    def _read_next_slot(self) -> float:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)["next_slot"]
+        except (OSError, ValueError, KeyError):
+            return 0.0
+
+    def _write_next_slot(self, value: float):
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump({"next_slot": value}, f)
+
+
+class RetryPolicy:
+    """
+    Расписание повторов запросов: экспоненциальная пауза со случайным разбросом
+    (full jitter) либо пауза из заголовка Retry-After, если сервер её указал.
+    """
+
+    def __init__(self, max_retries: int = 2, backoff_factor: float = 0.3,
+                 max_backoff: float = 30, statuses=(429, 502, 503, 504), seed: int = None):
+        """
+        Аргументы:
+            max_retries (int): Сколько раз повторять запрос.
+            backoff_factor (float): Пауза перед первым повтором; далее удваивается.
+            max_backoff (float): Верхняя граница паузы в секундах, в том числе для Retry-After.
+            statuses (Iterable[int]): HTTP-статусы, при которых запрос повторяется.
+            seed (int): Зерно генератора разброса для воспроизводимости.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self._random = random.Random(seed)
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        """
+        Нужно ли повторить запрос.
+
+        Аргументы:
+            status (int): HTTP-статус ответа.
+            attempt (int): Номер уже выполненного повтора, начиная с 0.
+        """
+        return status in self.statuses and attempt < self.max_retries
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Возвращает паузу перед очередным повтором в секундах.
+
+        Аргументы:
+            attempt (int): Номер повтора, начиная с 0.
+            retry_after (str): Значение заголовка Retry-After: секунды или HTTP-дата.
+        """
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return min(requested, self.max_backoff)
+        ceiling = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        return self._random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: str):
+    """
+    Разбирает заголовок Retry-After.
+
+    Возвращает:
+        float | None: Пауза в секундах или None, если заголовок отсутствует или некорректен.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,111 @@
+"""
+Модуль объединения одинаковых одновременных запросов (single-flight).
+
+Пока запрос с некоторым ключом выполняется, остальные вызовы с тем же ключом
+не отправляют свой запрос, а ждут его окончания и получают тот же результат
+или то же исключение. Работает как для потоков, так и для корутин asyncio.
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Группа вызовов, в которой одновременные вызовы с одинаковым ключом выполняются один раз.
+
+    Результат разделяется между всеми ожидавшими вызовами; изменять его нельзя.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.collapsed = 0
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Выполняет func или дожидается уже выполняемого вызова с тем же ключом.
+
+        Аргументы:
+            key (Hashable): Ключ запроса.
+            func (Callable[[], Any]): Функция, выполняющая запрос.
+
+        Возвращает:
+            Результат func, общий для всех одновременных вызовов с ключом key.
+
+        Исключения:
+            Exception: Исключение, возникшее в func.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.collapsed += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key, factory):
+        """
+        Асинхронный вариант do(): выполняет корутину factory() или дожидается
+        уже выполняемой корутины с тем же ключом в этом же цикле событий.
+
+        Отмена одного из ожидающих не отменяет общий запрос для остальных.
+
+        Аргументы:
+            key (Hashable): Ключ запроса.
+            factory (Callable[[], Awaitable]): Функция, создающая корутину запроса.
+        """
+        loop = asyncio.get_running_loop()
+        full_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(full_key)
+            if task is None:
+                task = self._tasks[full_key] = loop.create_task(factory())
+                task.add_done_callback(lambda _: self._forget_task(full_key))
+                self.executions += 1
+            else:
+                self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _forget_task(self, full_key):
+        with self._lock:
+            self._tasks.pop(full_key, None)
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики: всего вызовов, выполненных запросов и объединённых вызовов.
+        """
+        with self._lock:
+            return {
+                "calls": self.executions + self.collapsed,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
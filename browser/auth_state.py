@@ -0,0 +1,160 @@
+"""
+Модуль повторного использования состояния авторизации в UI-тестах.
+
+Вход через форму выполняется один раз для каждой пары логин/пароль, после чего
+cookies и localStorage сохраняются и подставляются в браузер следующих тестов.
+Если сохранённое состояние истекло или перестало работать, вход повторяется.
+"""
+
+import threading
+import time
+
+import allure
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pages.auth_page import AuthPage
+
+_READ_LOCAL_STORAGE_JS = """
+const items = {};
+for (let i = 0; i < window.localStorage.length; i++) {
+    const key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+_WRITE_LOCAL_STORAGE_JS = """
+const items = arguments[0];
+for (const [key, value] of Object.entries(items)) {
+    window.localStorage.setItem(key, value);
+}
+"""
+
+
+class AuthSnapshot:
+    """
+    Снимок состояния авторизованного браузера.
+    """
+
+    __slots__ = ("cookies", "local_storage", "created_at")
+
+    def __init__(self, cookies: list, local_storage: dict):
+        """
+        Аргументы:
+            cookies (list): Cookies в формате WebDriver.get_cookies().
+            local_storage (dict): Содержимое localStorage страницы.
+        """
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.created_at = time.time()
+
+    def is_expired(self, max_age: float) -> bool:
+        """
+        Проверяет, устарел ли снимок по возрасту или сроку действия cookies.
+
+        Аргументы:
+            max_age (float): Максимальный возраст снимка в секундах.
+        """
+        now = time.time()
+        if now - self.created_at > max_age:
+            return True
+        return any(cookie.get("expiry") is not None and cookie["expiry"] <= now
+                   for cookie in self.cookies)
+
+
+class AuthStateCache:
+    """
+    Кэш состояний авторизации по логину пользователя.
+    """
+
+    def __init__(self, base_url: str, max_age: float = 30 * 60):
+        """
+        Инициализация кэша.
+
+        Аргументы:
+            base_url (str): Базовый URL сайта.
+            max_age (float): Время, после которого вход выполняется заново, в секундах.
+        """
+        self.base_url = base_url
+        self.max_age = max_age
+        self.logins = 0
+        self.restores = 0
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    @allure.step("Получить авторизованный браузер для {username}")
+    def login(self, driver: WebDriver, username: str, password: str) -> bool:
+        """
+        Авторизует браузер: подставляет сохранённое состояние или входит через форму.
+
+        Аргументы:
+            driver (WebDriver): Экземпляр Selenium WebDriver.
+            username (str): Email или телефон пользователя.
+            password (str): Пароль пользователя.
+
+        Возвращает:
+            bool: True, если пользователь авторизован.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(username)
+        if snapshot is not None and not snapshot.is_expired(self.max_age):
+            self._restore(driver, snapshot)
+            if AuthPage(driver, self.base_url).is_logged_in():
+                self.restores += 1
+                return True
+        with self._lock:
+            self._snapshots.pop(username, None)
+        auth = AuthPage(driver, self.base_url)
+        auth.open()
+        auth.login(username, password)
+        self.logins += 1
+        if not auth.is_logged_in():
+            return False
+        snapshot = self._capture(driver)
+        with self._lock:
+            self._snapshots[username] = snapshot
+        return True
+
+    def forget(self, username: str = None):
+        """
+        Удаляет сохранённое состояние пользователя или всех пользователей.
+        """
+        with self._lock:
+            if username is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(username, None)
+
+    @staticmethod
+    def _capture(driver: WebDriver) -> AuthSnapshot:
+        return AuthSnapshot(driver.get_cookies(), driver.execute_script(_READ_LOCAL_STORAGE_JS))
+
+    @allure.step("Восстановить сохранённую авторизацию")
+    def _restore(self, driver: WebDriver, snapshot: AuthSnapshot):
+        page = AuthPage(driver, self.base_url)
+        page.navigate(self.base_url)
+        try:
+            # CDP позволяет выставить cookies любых доменов, а не только текущего.
+            driver.execute_cdp_cmd(
+                "Network.setCookies", {"cookies": [_to_cdp_cookie(c) for c in snapshot.cookies]}
+            )
+        except (AttributeError, WebDriverException):
+            for cookie in snapshot.cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except WebDriverException:
+                    pass
+        driver.execute_script(_WRITE_LOCAL_STORAGE_JS, snapshot.local_storage)
+        driver.refresh()
+        page.invalidate()
+
+
+def _to_cdp_cookie(cookie: dict) -> dict:
+    """
+    Переводит cookie из формата WebDriver в параметр CDP Network.setCookies.
+    """
+    converted = {key: value for key, value in cookie.items() if key != "expiry"}
+    if "expiry" in cookie:
+        converted["expires"] = cookie["expiry"]
+    return converted
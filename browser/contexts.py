@@ -0,0 +1,233 @@
+"""
+Модуль изолированных контекстов браузера внутри одного процесса Chrome.
+
+Каждый контекст создаётся через CDP Target.createBrowserContext и похож на окно
+инкогнито: у него свои cookies, localStorage и кэш. Тест получает ContextDriver —
+драйвер, привязанный к вкладке своего контекста. Все ContextDriver одного Chrome
+делят сессию chromedriver: перед каждой командой драйвер при необходимости
+переключается на свою вкладку, а команды разных контекстов выполняются по очереди.
+Навигация выполняется через CDP Page.navigate без ожидания загрузки под блокировкой,
+поэтому страницы разных контекстов загружаются одновременно.
+
+Контекст занимает единицы мегабайт вместо сотен для отдельного Chrome.
+Пул создаётся на процесс: при запуске через pytest-xdist у каждого воркера свой Chrome,
+а тесты воркера идут по очереди, поэтому одновременно в нём открыт один контекст.
+Несколько контекстов одновременно использует только код, который сам работает
+в нескольких потоках (например, сверка сайта и API в tests/test_ui.py).
+"""
+
+import threading
+import time
+
+import allure
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from browser import lean
+
+_READY_STATE_JS = "return document.readyState;"
+
+
+class _SharedSession:
+    """
+    Общая для всех контекстов сессия chromedriver: корневой драйвер,
+    текущая вкладка и блокировка команд.
+    """
+
+    def __init__(self, root: WebDriver):
+        self.root = root
+        self.home = root.current_window_handle
+        self.current = self.home
+        self.lock = threading.RLock()
+
+    def switch(self, handle: str):
+        if self.current != handle:
+            WebDriver.execute(self.root, Command.SWITCH_TO_WINDOW, {"handle": handle})
+            self.current = handle
+
+
+class ContextDriver(webdriver.Chrome):
+    """
+    Драйвер, привязанный к вкладке изолированного контекста браузера.
+
+    Создаётся методом ContextPool.acquire(); метод quit() закрывает только свой контекст.
+    """
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError("ContextDriver создаётся через ContextPool.acquire()")
+
+    @classmethod
+    def _bind(cls, shared: _SharedSession, context_id: str, handle: str,
+              page_load_timeout: float) -> "ContextDriver":
+        driver = object.__new__(cls)
+        driver.__dict__.update(shared.root.__dict__)
+        # Вспомогательные объекты WebDriver хранят ссылку на драйвер и должны вести к этому.
+        for name in ("_switch_to", "_mobile", "_fedcm"):
+            helper = getattr(shared.root, name, None)
+            if helper is not None:
+                setattr(driver, name, type(helper)(driver))
+        driver._shared = shared
+        driver.context_id = context_id
+        driver.handle = handle
+        driver.page_load_timeout = page_load_timeout
+        return driver
+
+    def execute(self, driver_command, params=None):
+        with self._shared.lock:
+            self._shared.switch(self.handle)
+            result = super().execute(driver_command, params)
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self._shared.current = (params or {}).get("handle", self._shared.current)
+            return result
+
+    def get(self, url: str):
+        """
+        Открывает URL во вкладке контекста. Команда отправляется под общей блокировкой,
+        а окончание загрузки ожидается вне её, чтобы не задерживать другие контексты.
+
+        Исключения:
+            WebDriverException: Если навигация не удалась (сервер недоступен, ошибка DNS).
+            TimeoutException: Если страница не начала отображаться за page_load_timeout.
+        """
+        result = self.execute_cdp_cmd("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise WebDriverException(f"Не удалось открыть {url}: {result['errorText']}")
+        deadline = time.monotonic() + self.page_load_timeout
+        interval = 0.02
+        while True:
+            try:
+                if self.execute_script(_READY_STATE_JS) != "loading":
+                    return
+            except WebDriverException:
+                # Во время смены документа скрипт может не выполниться.
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Страница не загрузилась: {url}")
+            time.sleep(interval)
+            interval = min(interval * 1.5, 0.25)
+
+    def quit(self):
+        """
+        Закрывает контекст вместе с его вкладками, cookies и хранилищами.
+        Сам Chrome и остальные контексты продолжают работать.
+        """
+        shared = self._shared
+        with shared.lock:
+            shared.switch(shared.home)
+            try:
+                shared.root.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": self.context_id}
+                )
+            except WebDriverException:
+                pass
+
+
+class ContextPool:
+    """
+    Выдаёт изолированные контексты одного Chrome; каждый тест получает новый контекст,
+    который после теста уничтожается, поэтому очистка состояния не нужна.
+
+    Интерфейс совпадает с DriverPool: acquire(), release(), close().
+    """
+
+    def __init__(self, factory, size: int = 8, page_load_timeout: float = 30):
+        """
+        Инициализация пула.
+
+        Аргументы:
+            factory (Callable[[], WebDriver]): Функция запуска Chrome.
+            size (int): Максимальное число одновременно открытых контекстов.
+            page_load_timeout (float): Время ожидания загрузки страницы в get(), секунды.
+        """
+        self.factory = factory
+        self.size = size
+        self.page_load_timeout = page_load_timeout
+        self.created = 0
+        self.browsers = 0
+        self._shared = None
+        self._active = set()
+        self._condition = threading.Condition()
+
+    def warm_up(self, count: int = None):
+        """
+        Заранее запускает Chrome, чтобы первый тест не ждал его старта.
+        """
+        with self._condition:
+            self._ensure_browser()
+
+    @allure.step("Создать изолированный контекст браузера")
+    def acquire(self) -> ContextDriver:
+        """
+        Создаёт новый контекст; если открыто size контекстов, ждёт освобождения.
+
+        Возвращает:
+            ContextDriver: Драйвер вкладки нового контекста.
+        """
+        with self._condition:
+            while len(self._active) >= self.size:
+                self._condition.wait()
+            shared = self._ensure_browser()
+            driver = self._create_context(shared, self.page_load_timeout)
+            self._active.add(driver)
+            self.created += 1
+            return driver
+
+    def release(self, driver: ContextDriver):
+        """
+        Уничтожает контекст теста.
+
+        Аргументы:
+            driver (ContextDriver): Драйвер, полученный из acquire().
+        """
+        with self._condition:
+            self._active.discard(driver)
+            driver.quit()
+            self._condition.notify()
+
+    def close(self):
+        """
+        Закрывает все контексты и Chrome.
+        """
+        with self._condition:
+            self._active.clear()
+            if self._shared is not None:
+                try:
+                    self._shared.root.quit()
+                except WebDriverException:
+                    pass
+                self._shared = None
+
+    def _ensure_browser(self) -> _SharedSession:
+        if self._shared is not None:
+            try:
+                with self._shared.lock:
+                    self._shared.switch(self._shared.home)
+                    self._shared.root.current_window_handle
+                return self._shared
+            except WebDriverException:
+                self.close()
+        self._shared = _SharedSession(self.factory())
+        self.browsers += 1
+        return self._shared
+
+    @staticmethod
+    def _create_context(shared: _SharedSession, page_load_timeout: float) -> ContextDriver:
+        with shared.lock:
+            shared.switch(shared.home)
+            root = shared.root
+            before = set(root.window_handles)
+            context_id = root.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False}
+            )["browserContextId"]
+            target_id = root.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )["targetId"]
+            new_handles = set(root.window_handles) - before
+            handle = target_id if target_id in new_handles else next(iter(new_handles), target_id)
+        driver = ContextDriver._bind(shared, context_id, handle, page_load_timeout)
+        profile = lean.profile_of(root)
+        if profile is not None:
+            lean.attach(driver, profile)
+        return driver
@@ -0,0 +1,101 @@
+"""
+Модуль создания экземпляров Chrome WebDriver для UI-тестов.
+
+Путь к chromedriver определяется один раз: берётся закреплённый путь из конфигурации
+(офлайн-режим) либо результат ChromeDriverManager, сохранённый в общем файле кэша,
+который под lock-файлом разделяют все сессии и воркеры pytest-xdist.
+"""
+
+import json
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from browser import lean
+from utils.file_lock import file_lock
+
+DRIVER_CACHE_FILE = ".cache/chromedriver.json"
+
+_resolved_path = None
+
+
+def resolve_chromedriver(pinned_path: str = None, offline: bool = False,
+                         cache_file: str = DRIVER_CACHE_FILE,
+                         max_age: float = 24 * 60 * 60) -> str:
+    """
+    Возвращает путь к исполняемому файлу chromedriver.
+
+    Аргументы:
+        pinned_path (str): Закреплённый путь к chromedriver; если задан, используется как есть.
+        offline (bool): Запретить обращение к webdriver_manager; требует pinned_path.
+        cache_file (str): Файл, в котором хранится найденный путь между сессиями.
+        max_age (float): Через сколько секунд перепроверять версию драйвера.
+
+    Возвращает:
+        str: Путь к chromedriver.
+
+    Исключения:
+        FileNotFoundError: Если закреплённый путь не существует.
+        ValueError: Если включён офлайн-режим, а путь не закреплён.
+    """
+    global _resolved_path
+    if pinned_path:
+        if not os.path.isfile(pinned_path):
+            raise FileNotFoundError(f"chromedriver не найден: {pinned_path}")
+        return pinned_path
+    if offline:
+        raise ValueError("В офлайн-режиме нужно указать chromedriver_path в config.ini")
+    if _resolved_path and os.path.isfile(_resolved_path):
+        return _resolved_path
+    with file_lock(cache_file + ".lock"):
+        path = _read_cached_path(cache_file, max_age)
+        if path is None:
+            # Импорт здесь, чтобы офлайн-режим не требовал webdriver_manager.
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "resolved_at": time.time()}, f)
+    _resolved_path = path
+    return path
+
+
+def _read_cached_path(cache_file: str, max_age: float):
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    path = cached.get("path")
+    if not path or not os.path.isfile(path):
+        return None
+    if time.time() - cached.get("resolved_at", 0) > max_age:
+        return None
+    return path
+
+
+def create_chrome(driver_path: str = None, headless: bool = True,
+                  lean_profile: lean.LeanProfile = None) -> WebDriver:
+    """
+    Запускает новый экземпляр Chrome.
+
+    Аргументы:
+        driver_path (str): Путь к chromedriver; по умолчанию resolve_chromedriver().
+        headless (bool): Запускать браузер без графического интерфейса.
+        lean_profile (LeanProfile): Профиль облегчённой загрузки страниц; None — обычный режим.
+
+    Возвращает:
+        WebDriver: Драйвер запущенного браузера.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless')
+    if lean_profile is not None:
+        lean_profile.apply_options(options)
+    service = Service(driver_path or resolve_chromedriver())
+    driver = webdriver.Chrome(service=service, options=options)
+    if lean_profile is not None:
+        lean.attach(driver, lean_profile)
+    return driver
@@ -0,0 +1,132 @@
+"""
+Модуль «облегчённого» режима браузера для UI-тестов.
+
+Профиль задаёт стратегию загрузки страниц и список блокируемых ресурсов:
+реклама, аналитика, шрифты, медиа и изображения. Блокировка выполняется через
+CDP Network.setBlockedURLs по шаблонам URL (расширениям файлов и хостам,
+с которых Кинопоиск отдаёт изображения), поэтому каждый PageObject может
+разрешить нужные ему типы ресурсов (например, изображения для проверки постера).
+"""
+
+import weakref
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Шаблоны URL для типов ресурсов; CDP не умеет блокировать по типу без перехвата запросов.
+# Постеры и кадры Кинопоиска отдаются с хостов изображений по URL без расширения,
+# поэтому для изображений кроме расширений перечислены и эти хосты.
+RESOURCE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+              "*avatars.mds.yandex.net*", "*st.kp.yandex.net/images*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"),
+    "stylesheet": ("*.css*",),
+}
+
+DEFAULT_BLOCKED_URLS = (
+    "*mc.yandex.ru*",
+    "*an.yandex.ru*",
+    "*yandex.ru/ads*",
+    "*adfox*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+)
+
+# Профиль и текущий набор блокировок для каждого драйвера.
+_attached = weakref.WeakKeyDictionary()
+
+
+class LeanProfile:
+    """
+    Набор правил облегчённой загрузки страниц.
+    """
+
+    def __init__(self, block_types=("image", "font", "media"),
+                 block_urls=DEFAULT_BLOCKED_URLS, page_load_strategy: str = "eager"):
+        """
+        Аргументы:
+            block_types (Iterable[str]): Блокируемые типы ресурсов, ключи RESOURCE_PATTERNS.
+            block_urls (Iterable[str]): Дополнительные шаблоны блокируемых URL.
+            page_load_strategy (str): Стратегия загрузки страниц: normal, eager или none.
+        """
+        unknown = set(block_types) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Неизвестные типы ресурсов: {sorted(unknown)}")
+        self.block_types = tuple(block_types)
+        self.block_urls = tuple(block_urls)
+        self.page_load_strategy = page_load_strategy
+
+    def apply_options(self, options):
+        """
+        Применяет профиль к настройкам Chrome перед запуском.
+
+        Аргументы:
+            options (ChromeOptions): Настройки запуска Chrome.
+        """
+        options.page_load_strategy = self.page_load_strategy
+
+    def blocked_urls(self, allow_types=(), extra_urls=()) -> list:
+        """
+        Возвращает шаблоны блокируемых URL с учётом правил страницы.
+
+        Аргументы:
+            allow_types (Iterable[str]): Типы ресурсов, которые странице нужны.
+            extra_urls (Iterable[str]): Дополнительные шаблоны, блокируемые на странице.
+
+        Возвращает:
+            list: Шаблоны URL для Network.setBlockedURLs.
+        """
+        patterns = list(self.block_urls) + list(extra_urls)
+        for resource_type in self.block_types:
+            if resource_type not in allow_types:
+                patterns.extend(RESOURCE_PATTERNS[resource_type])
+        return patterns
+
+
+def attach(driver: WebDriver, profile: LeanProfile):
+    """
+    Включает профиль для запущенного драйвера и применяет блокировки по умолчанию.
+
+    Аргументы:
+        driver (WebDriver): Драйвер Chrome.
+        profile (LeanProfile): Профиль облегчённой загрузки.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    _attached[driver] = [profile, None]
+    apply_page_rules(driver)
+
+
+def profile_of(driver: WebDriver):
+    """
+    Возвращает профиль, включённый для драйвера, или None.
+    """
+    state = _attached.get(driver)
+    return state[0] if state is not None else None
+
+
+def apply_page_rules(driver: WebDriver, allow_types=(), extra_urls=()):
+    """
+    Настраивает блокировки под конкретную страницу перед переходом на неё.
+    Для драйвера без профиля ничего не делает; повторная установка того же
+    набора правил не отправляет команд браузеру.
+
+    Аргументы:
+        driver (WebDriver): Драйвер Chrome.
+        allow_types (Iterable[str]): Типы ресурсов, которые странице нужны.
+        extra_urls (Iterable[str]): Дополнительные шаблоны, блокируемые на странице.
+    """
+    state = _attached.get(driver)
+    if state is None:
+        return
+    profile, current = state
+    patterns = profile.blocked_urls(allow_types, extra_urls)
+    if patterns == current:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        state[1] = patterns
+    except WebDriverException:
+        # Браузер без поддержки CDP: страница загрузится без блокировок.
+        pass
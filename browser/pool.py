@@ -0,0 +1,191 @@
+"""
+Модуль пула браузеров для повторного использования запущенных Chrome между тестами.
+
+Запуск Chrome занимает секунды, поэтому пул держит несколько «тёплых» драйверов,
+очищает их состояние между тестами и пересоздаёт драйвер после заданного
+числа использований или после падения браузера.
+"""
+
+import threading
+
+import allure
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class DriverPool:
+    """
+    Пул драйверов WebDriver.
+
+    Драйвер берётся методом acquire() и возвращается методом release().
+    Перед возвратом в пул у драйвера закрываются лишние вкладки, удаляются cookies
+    и очищаются localStorage и sessionStorage.
+    """
+
+    def __init__(self, factory, size: int = 1, max_uses: int = 20):
+        """
+        Инициализация пула.
+
+        Аргументы:
+            factory (Callable[[], WebDriver]): Функция запуска нового драйвера.
+            size (int): Максимальное число драйверов в пуле.
+            max_uses (int): Число тестов, после которого драйвер пересоздаётся.
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.created = 0
+        self.recycled = 0
+        self._idle = []
+        self._uses = {}
+        # Запущенные драйверы и места, зарезервированные под запускаемые.
+        self._slots = 0
+        self._condition = threading.Condition()
+
+    def warm_up(self, count: int = None):
+        """
+        Заранее запускает драйверы, чтобы первые тесты не ждали старта Chrome.
+
+        Аргументы:
+            count (int): Сколько драйверов запустить; по умолчанию размер пула.
+        """
+        count = min(count or self.size, self.size)
+        while True:
+            with self._condition:
+                if self._slots >= count:
+                    return
+                self._slots += 1
+            driver = self._create()
+            with self._condition:
+                self._idle.append(driver)
+                self._condition.notify()
+
+    def acquire(self) -> WebDriver:
+        """
+        Выдаёт исправный драйвер из пула, при необходимости запуская новый.
+        Если все драйверы заняты и пул заполнен, ждёт освобождения.
+
+        Под блокировкой пула только выбирается свободный драйвер или резервируется
+        место под новый; запуск и проверка браузера выполняются вне её,
+        поэтому потоки не ждут чужого запуска Chrome.
+
+        Возвращает:
+            WebDriver: Драйвер с чистым состоянием.
+        """
+        while True:
+            with self._condition:
+                while not self._idle and self._slots >= self.size:
+                    self._condition.wait()
+                driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    self._slots += 1
+            if driver is None:
+                driver = self._create()
+            elif not self._is_alive(driver):
+                self._discard(driver)
+                continue
+            with self._condition:
+                self._uses[driver] += 1
+            return driver
+
+    def release(self, driver: WebDriver):
+        """
+        Возвращает драйвер в пул после очистки состояния.
+
+        Драйвер, исчерпавший max_uses или не переживший очистку, закрывается.
+        Очистка выполняется вне блокировки пула.
+
+        Аргументы:
+            driver (WebDriver): Драйвер, полученный из acquire().
+        """
+        with self._condition:
+            expired = self._uses.get(driver, 0) >= self.max_uses
+        if expired or not self._reset(driver):
+            self._discard(driver)
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def close(self):
+        """
+        Закрывает все драйверы пула.
+        """
+        with self._condition:
+            drivers = list(self._uses)
+            self._uses.clear()
+            self._idle.clear()
+            self._slots -= len(drivers)
+            self._condition.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _create(self) -> WebDriver:
+        """
+        Запускает драйвер на зарезервированное место; при ошибке запуска место освобождается.
+        """
+        try:
+            driver = self.factory()
+        except BaseException:
+            with self._condition:
+                self._slots -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._uses[driver] = 0
+            self.created += 1
+        return driver
+
+    def _discard(self, driver: WebDriver):
+        with self._condition:
+            if self._uses.pop(driver, None) is not None:
+                self._slots -= 1
+                self.recycled += 1
+            self._condition.notify()
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    @allure.step("Очистить состояние браузера")
+    def _reset(driver: WebDriver) -> bool:
+        """
+        Закрывает лишние вкладки, удаляет cookies и очищает хранилища страницы.
+
+        Возвращает:
+            bool: True, если очистка прошла успешно и драйвер можно использовать снова.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear();"
+                )
+            except WebDriverException:
+                # На about:blank и страницах ошибок хранилища недоступны.
+                pass
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
@@ -5,17 +5,25 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import allure
 
-class AuthPage:
+from pages.base_page import BasePage
+
+class AuthPage(BasePage):
     """
     Позволяет открывать страницу, выполнять вход, получать сообщения об ошибках 
     и проверять успешную авторизацию пользователя.
     """
 
+    locators = {
+        "login_input": (By.CSS_SELECTOR, "input[name='login']"),
+        "password_input": (By.CSS_SELECTOR, "input[name='password']"),
+        "submit": (By.CSS_SELECTOR, "button[type='submit']"),
+        "error": (By.CSS_SELECTOR, ".error-message"),
+        "logout": (By.CSS_SELECTOR, "a[href*='logout']"),
+    }
+
     def __init__(self, driver: WebDriver, base_url: str):
         """
         Инициализация страницы авторизации.
@@ -24,7 +32,7 @@ class AuthPage:
             driver (WebDriver): Экземпляр Selenium WebDriver.
             base_url (str): Базовый URL тестируемого приложения.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.url = base_url + "/login"
 
     @allure.step("Открыть страницу авторизации")
@@ -32,7 +40,7 @@ class AuthPage:
         """
         Открывает страницу авторизации в браузере.
         """
-        self.driver.get(self.url)
+        self.navigate(self.url)
 
     @allure.step("Войти по email или телефону: {username}")
     def login(self, username: str, password: str):
@@ -44,9 +52,9 @@ class AuthPage:
             password (str): Пароль пользователя.
         """
         try:
-            self.driver.find_element(By.CSS_SELECTOR, "input[name='login']").send_keys(username)
-            self.driver.find_element(By.CSS_SELECTOR, "input[name='password']").send_keys(password)
-            self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+            self.with_element("login_input", lambda el: el.send_keys(username))
+            self.with_element("password_input", lambda el: el.send_keys(password))
+            self.click("submit")
         except (NoSuchElementException, TimeoutException) as e:
             allure.attach(str(e), name="Ошибка при вводе логина/пароля",
                           attachment_type=allure.attachment_type.TEXT)
@@ -57,25 +65,27 @@ class AuthPage:
         """
         Получает текст сообщения об ошибке при неудачной авторизации.
 
+        Ожидание завершается, как только появляется сообщение об ошибке
+        или признак успешного входа.
+
         Возвращает:
             str: Текст сообщения об ошибке, либо пустая строка если его нет.
         """
-        try:
-            error = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, ".error-message"))
-            )
-            return error.text
-        except TimeoutException:
-            return ""
-        except NoSuchElementException:
+        found = self.waits.first_selector(
+            {"error": self.css("error"), "logged_in": self.css("logout")}
+        )
+        if found != "error":
             return ""
+        return self.probe(error=("text", "error"))["error"]
 
     @allure.step("Проверка, что пользователь авторизован")
     def is_logged_in(self) -> bool:
         """
-        Проверяет, что пользователь успешно авторизовался.
+        Проверяет, что пользователь успешно авторизовался: HTML страницы содержит "logout"
+        (ссылка, кнопка или форма выхода). Подстрока ищется в браузере,
+        HTML страницы не передаётся.
 
         Возвращает:
             bool: True, если признак авторизации обнаружен, иначе False.
         """
-        return "logout" in self.driver.page_source
+        return self.probe(found=("html_contains", "logout"))["found"]
@@ -0,0 +1,353 @@
+"""
+Модуль базового PageObject-класса с общими методами для всех страниц.
+
+Локаторы страниц объявляются в словаре locators и наследуются подклассами.
+Проверки состояния страницы (probe) выполняются в браузере и возвращают
+только результат, а не HTML страницы.
+Найденные элементы кэшируются до следующей навигации или изменения страницы:
+состояние страницы общее для всех PageObject одного драйвера, поэтому переход,
+выполненный одной страницей, сбрасывает кэш остальных. Клики выполняются
+через click(), который после клика тоже сбрасывает кэш: клик может открыть
+другую страницу или перестроить текущую.
+
+Если браузер запущен с облегчённым профилем (browser.lean), перед переходом
+на страницу применяются её правила загрузки ресурсов: allowed_resources
+и blocked_urls.
+"""
+
+import weakref
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+
+from browser import lean
+from pages.waits import PageWaits
+
+_READ_ELEMENTS_JS = """
+const selector = arguments[0];
+const attributes = arguments[1];
+return Array.from(document.querySelectorAll(selector), el => {
+    const style = window.getComputedStyle(el);
+    const visible = el.getClientRects().length > 0
+        && style.visibility !== 'hidden'
+        && parseFloat(style.opacity) !== 0;
+    const values = {};
+    for (const name of attributes) {
+        values[name] = el.getAttribute(name);
+    }
+    return {
+        text: visible ? el.innerText.trim() : '',
+        visible: visible,
+        attributes: values
+    };
+});
+"""
+
+_PROBE_JS = """
+const checks = arguments[0];
+const maxText = arguments[1];
+const isVisible = el => {
+    const style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0
+        && style.visibility !== 'hidden'
+        && parseFloat(style.opacity) !== 0;
+};
+const firstVisible = selector =>
+    Array.from(document.querySelectorAll(selector)).find(isVisible) || null;
+const hasCookie = name => document.cookie.split(';')
+    .some(part => part.trim().split('=')[0] === name);
+const result = {};
+for (const [name, check] of Object.entries(checks)) {
+    const [kind, arg, extra] = check;
+    let value;
+    switch (kind) {
+        case 'present': value = document.querySelector(arg) !== null; break;
+        case 'visible': value = firstVisible(arg) !== null; break;
+        case 'count': value = document.querySelectorAll(arg).length; break;
+        case 'text': {
+            const el = firstVisible(arg);
+            value = el ? el.innerText.trim().slice(0, maxText) : '';
+            break;
+        }
+        case 'text_contains': {
+            const el = firstVisible(arg);
+            value = el !== null && el.innerText.includes(extra);
+            break;
+        }
+        case 'url_contains': value = window.location.href.includes(arg); break;
+        case 'html_contains': value = document.documentElement.outerHTML.includes(arg); break;
+        case 'cookie': value = hasCookie(arg); break;
+        default: throw new Error('Unknown probe: ' + kind);
+    }
+    result[name] = value;
+}
+return result;
+"""
+
+# Проверки probe(), аргументом которых является CSS-селектор или имя локатора.
+_SELECTOR_PROBES = ("present", "visible", "count", "text", "text_contains")
+# Число аргументов каждой проверки probe() после её вида.
+_PROBE_ARITY = {
+    "present": 1, "visible": 1, "count": 1, "text": 1, "text_contains": 2,
+    "url_contains": 1, "html_contains": 1, "cookie": 1,
+}
+PROBE_TEXT_LIMIT = 2000
+
+# Номер состояния страницы для каждого драйвера; растёт при навигации.
+_page_states = weakref.WeakKeyDictionary()
+
+
+class BasePage:
+    """
+    Базовый класс PageObject.
+
+    Хранит драйвер и ожидания страницы, реестр локаторов и кэш найденных элементов,
+    а также позволяет читать коллекции элементов одним запросом к браузеру.
+    """
+
+    locators = {}
+    allowed_resources = ()
+    blocked_urls = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        merged = {}
+        for base in reversed(cls.__mro__[1:]):
+            merged.update(getattr(base, "locators", {}))
+        merged.update(cls.__dict__.get("locators", {}))
+        cls.locators = merged
+
+    def __init__(self, driver: WebDriver):
+        """
+        Инициализация страницы.
+
+        Аргументы:
+            driver (WebDriver): Экземпляр Selenium WebDriver.
+        """
+        self.driver = driver
+        self.waits = PageWaits(driver)
+        self._cache = {}
+        self._cache_state = None
+
+    def locator(self, name: str) -> tuple:
+        """
+        Возвращает локатор из реестра страницы.
+
+        Аргументы:
+            name (str): Имя локатора.
+
+        Возвращает:
+            tuple: Пара (стратегия поиска, значение).
+
+        Исключения:
+            KeyError: Если локатор не объявлен.
+        """
+        return self.locators[name]
+
+    def css(self, name: str) -> str:
+        """
+        Возвращает CSS-селектор локатора для скриптов, выполняемых в браузере.
+
+        Исключения:
+            ValueError: Если локатор задан не CSS-селектором.
+        """
+        by, value = self.locator(name)
+        if by != By.CSS_SELECTOR:
+            raise ValueError(f"Локатор '{name}' не является CSS-селектором")
+        return value
+
+    def navigate(self, url: str):
+        """
+        Открывает URL с правилами загрузки ресурсов этой страницы и сбрасывает кэш элементов.
+
+        Аргументы:
+            url (str): Адрес страницы.
+        """
+        lean.apply_page_rules(self.driver, self.allowed_resources, self.blocked_urls)
+        self.driver.get(url)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Отмечает, что страница изменилась: кэш элементов всех PageObject
+        этого драйвера становится недействительным.
+        """
+        _page_states[self.driver] = _page_states.get(self.driver, 0) + 1
+        self._cache.clear()
+
+    def find(self, name: str) -> WebElement:
+        """
+        Находит элемент по имени локатора; повторный вызов в том же состоянии
+        страницы возвращает элемент из кэша без запроса к браузеру.
+
+        Исключения:
+            NoSuchElementException: Если элемент не найден.
+        """
+        return self._cached(("one", name), lambda: self.driver.find_element(*self.locator(name)))
+
+    def find_all(self, name: str) -> list:
+        """
+        Находит все элементы по имени локатора, с кэшированием как в find().
+        Пустой результат не кэшируется: элементы могут появиться позже.
+        """
+        return self._cached(("all", name), lambda: self.driver.find_elements(*self.locator(name)))
+
+    def wait_for(self, name: str, timeout: float = None) -> WebElement:
+        """
+        Ждёт появления элемента в DOM и кладёт его в кэш.
+
+        Исключения:
+            TimeoutException: Если элемент не появился за timeout.
+        """
+        return self._cached(
+            ("one", name),
+            lambda: self.waits.until(EC.presence_of_element_located(self.locator(name)), timeout),
+        )
+
+    def with_element(self, name: str, action):
+        """
+        Выполняет action над элементом из кэша. Если элемент устарел
+        (StaleElementReferenceException), кэш сбрасывается и действие повторяется
+        один раз на заново найденном элементе.
+
+        Аргументы:
+            name (str): Имя локатора.
+            action (Callable[[WebElement], Any]): Действие над элементом.
+
+        Возвращает:
+            Any: Результат action.
+        """
+        try:
+            return action(self.find(name))
+        except StaleElementReferenceException:
+            self.invalidate()
+            return action(self.find(name))
+
+    def with_elements(self, name: str, action):
+        """
+        Выполняет action над списком элементов из кэша, повторяя его один раз
+        на заново найденных элементах, если список устарел, как в with_element().
+
+        Аргументы:
+            name (str): Имя локатора.
+            action (Callable[[list[WebElement]], Any]): Действие над списком элементов.
+
+        Возвращает:
+            Any: Результат action.
+        """
+        try:
+            return action(self.find_all(name))
+        except StaleElementReferenceException:
+            self.invalidate()
+            return action(self.find_all(name))
+
+    def click(self, name: str, index: int = None):
+        """
+        Кликает по элементу и сбрасывает кэш элементов, так как клик может
+        вызвать переход или изменить страницу.
+
+        Аргументы:
+            name (str): Имя локатора.
+            index (int): Номер элемента среди всех найденных; None — первый найденный через find().
+
+        Исключения:
+            NoSuchElementException: Если элемент не найден.
+            IndexError: Если index вне диапазона найденных элементов.
+        """
+        if index is None:
+            self.with_element(name, lambda el: el.click())
+        else:
+            self.with_elements(name, lambda elements: elements[index].click())
+        self.invalidate()
+
+    def _cached(self, key: tuple, lookup):
+        state = _page_states.get(self.driver, 0)
+        if self._cache_state != state:
+            self._cache.clear()
+            self._cache_state = state
+        if key in self._cache:
+            return self._cache[key]
+        value = lookup()
+        if value:
+            self._cache[key] = value
+        return value
+
+    def read_elements(self, selector: str, attributes=()) -> list:
+        """
+        Читает текст, видимость и атрибуты всех элементов по CSS-селектору
+        за один вызов execute_script, независимо от числа элементов.
+
+        Аргументы:
+            selector (str): CSS-селектор элементов или имя локатора из реестра.
+            attributes (Iterable[str]): Имена атрибутов, которые нужно прочитать.
+
+        Возвращает:
+            list: Словари с ключами text, visible и attributes в порядке элементов на странице.
+                Как и WebElement.text, текст скрытых элементов пустой.
+        """
+        if selector in self.locators:
+            selector = self.css(selector)
+        return self.driver.execute_script(_READ_ELEMENTS_JS, selector, list(attributes))
+
+    def read_texts(self, selector: str) -> list:
+        """
+        Читает тексты всех элементов по CSS-селектору одним запросом к браузеру.
+
+        Аргументы:
+            selector (str): CSS-селектор элементов или имя локатора из реестра.
+
+        Возвращает:
+            list: Тексты элементов.
+        """
+        return [element["text"] for element in self.read_elements(selector)]
+
+    def probe(self, **checks) -> dict:
+        """
+        Выполняет несколько проверок состояния страницы в браузере за один запрос
+        и возвращает только их результаты, независимо от размера страницы.
+
+        Виды проверок (селектор — CSS-селектор или имя локатора из реестра):
+            ("present", селектор) — элемент есть в DOM, bool;
+            ("visible", селектор) — хотя бы один элемент отображается, bool;
+            ("count", селектор) — число элементов, int;
+            ("text", селектор) — текст первого видимого элемента или "", str;
+            ("text_contains", селектор, подстрока) — текст первого видимого элемента
+                содержит подстроку, bool;
+            ("url_contains", подстрока) — адрес страницы содержит подстроку, bool;
+            ("html_contains", подстрока) — HTML страницы содержит подстроку, bool;
+            ("cookie", имя) — cookie доступна странице (не HttpOnly), bool.
+
+        Пример:
+            page.probe(logged_in=("present", "logout"), error=("text", "error"))
+
+        Возвращает:
+            dict: Результаты проверок по их именам.
+
+        Исключения:
+            ValueError: Если вид проверки неизвестен или у неё не хватает аргументов.
+        """
+        prepared = {}
+        for name, (kind, *args) in checks.items():
+            if kind not in _PROBE_ARITY:
+                raise ValueError(f"Неизвестная проверка: {kind}")
+            if len(args) != _PROBE_ARITY[kind]:
+                raise ValueError(
+                    f"Проверка '{name}' ({kind}) ожидает аргументов: {_PROBE_ARITY[kind]}, "
+                    f"передано: {len(args)}"
+                )
+            if kind in _SELECTOR_PROBES and args[0] in self.locators:
+                args[0] = self.css(args[0])
+            prepared[name] = [kind, *args]
+        return self.driver.execute_script(_PROBE_JS, prepared, PROBE_TEXT_LIMIT)
+
+    def is_present(self, selector: str) -> bool:
+        """
+        Проверяет наличие элемента в DOM одним запросом к браузеру без поиска WebElement.
+
+        Аргументы:
+            selector (str): CSS-селектор элемента или имя локатора из реестра.
+        """
+        return self.probe(found=("present", selector))["found"]
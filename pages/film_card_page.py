@@ -6,12 +6,12 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
 import allure
 
-class FilmCardPage:
+from pages.base_page import BasePage
+
+class FilmCardPage(BasePage):
     """
     PageObject для карточки фильма.
 
@@ -19,6 +19,17 @@ class FilmCardPage:
     а также выполнять взаимодействие с элементами карточки.
     """
 
+    locators = {
+        "title": (By.CSS_SELECTOR, ".film-title"),
+        "description": (By.CSS_SELECTOR, ".film-description"),
+        "actors": (By.CSS_SELECTOR, ".film-actors .actor"),
+        "poster": (By.CSS_SELECTOR, ".film-poster img"),
+        "error": (By.CSS_SELECTOR, ".error-message"),
+        "disabled": (By.CSS_SELECTOR, ".film-card [disabled]"),
+    }
+    # Изображения нужны для проверки постера в has_poster().
+    allowed_resources = ("image",)
+
     def __init__(self, driver: WebDriver):
         """
         Инициализация объекта FilmCardPage.
@@ -26,7 +37,7 @@ class FilmCardPage:
         Аргументы:
             driver (WebDriver): Экземпляр Selenium WebDriver.
         """
-        self.driver = driver
+        super().__init__(driver)
 
     @allure.step("Открыть карточку фильма по URL: {url}")
     def open_by_url(self, url: str):
@@ -36,7 +47,7 @@ class FilmCardPage:
         Аргументы:
             url (str): URL страницы карточки фильма.
         """
-        self.driver.get(url)
+        self.navigate(url)
 
     @allure.step("Получить название фильма")
     def get_title(self) -> str:
@@ -46,10 +57,8 @@ class FilmCardPage:
         Возвращает:
             str: Название фильма.
         """
-        WebDriverWait(self.driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".film-title"))
-        )
-        return self.driver.find_element(By.CSS_SELECTOR, ".film-title").text
+        self.wait_for("title")
+        return self.with_element("title", lambda el: el.text)
 
     @allure.step("Получить описание фильма")
     def get_description(self) -> str:
@@ -59,8 +68,8 @@ class FilmCardPage:
         Возвращает:
             str: Описание, либо пустая строка, если элемент не найден.
         """
-        desc = self.driver.find_elements(By.CSS_SELECTOR, ".film-description")
-        return desc.text if desc else ""
+        desc = self.read_texts("description")
+        return desc[0] if desc else ""
 
     @allure.step("Получить список актёров")
     def get_actors(self) -> list:
@@ -70,8 +79,7 @@ class FilmCardPage:
         Возвращает:
             list: Список имён актёров.
         """
-        actors = self.driver.find_elements(By.CSS_SELECTOR, ".film-actors .actor")
-        return [a.text for a in actors]
+        return self.read_texts("actors")
 
     @allure.step("Проверить наличие постера")
     def has_poster(self) -> bool:
@@ -81,8 +89,8 @@ class FilmCardPage:
         Возвращает:
             bool: True, если хотя бы один постер найден и отображён.
         """
-        posters = self.driver.find_elements(By.CSS_SELECTOR, ".film-poster img")
-        return bool(posters) and all(p.is_displayed() for p in posters)
+        posters = self.read_elements("poster")
+        return bool(posters) and all(p["visible"] for p in posters)
 
     @allure.step("Кликнуть по имени актёра №{index}")
     def click_actor(self, index: int = 0):
@@ -95,11 +103,9 @@ class FilmCardPage:
         Исключения:
             IndexError: Если индекс вне диапазона списка актёров.
         """
-        actors = self.driver.find_elements(By.CSS_SELECTOR, ".film-actors .actor")
-        if index < len(actors):
-            actors[index].click()
-        else:
+        if index >= len(self.find_all("actors")):
             raise IndexError("Actor index out of range.")
+        self.click("actors", index)
 
     @allure.step("Проверить наличие сообщения об ошибке или отсутствии карточки")
     def get_error_message(self) -> str:
@@ -109,8 +115,7 @@ class FilmCardPage:
         Возвращает:
             str: Текст ошибки или пустая строка, если элемент не найден.
         """
-        err = self.driver.find_elements(By.CSS_SELECTOR, ".error-message")
-        return err.text if err else ""
+        return self.probe(error=("text", "error"))["error"]
 
     @allure.step("Проверить, открыт ли карточка фильма")
     def is_opened(self) -> bool:
@@ -120,7 +125,7 @@ class FilmCardPage:
         Возвращает:
             bool: True, если карточка открыта.
         """
-        return len(self.driver.find_elements(By.CSS_SELECTOR, ".film-title")) > 0
+        return self.is_present("title")
 
     @allure.step("Клик по некликабельному элементу")
     def try_click_invalid_element(self):
@@ -130,10 +135,9 @@ class FilmCardPage:
         Исключения:
             NoSuchElementException: Если такой элемент не найден.
         """
-        elems = self.driver.find_elements(By.CSS_SELECTOR, ".film-card [disabled]")
-        if elems:
+        if self.find_all("disabled"):
             try:
-                elems.click()
+                self.click("disabled", 0)
             except Exception as e:
                 allure.attach(str(e), name="Ошибка клика по некликабельному элементу",
                               attachment_type=allure.attachment_type.TEXT)
@@ -6,11 +6,11 @@
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import allure
 
-class SearchPage:
+from pages.base_page import BasePage
+
+class SearchPage(BasePage):
     """
     PageObject для страницы поиска фильмов.
 
@@ -18,6 +18,13 @@ class SearchPage:
     получать список найденных названий фильмов.
     """
 
+    locators = {
+        "search_input": (By.CSS_SELECTOR, "input[name='search']"),
+        "submit": (By.CSS_SELECTOR, "button[type='submit']"),
+        "results": (By.CSS_SELECTOR, ".movie-title"),
+        "empty_results": (By.CSS_SELECTOR, ".search-empty"),
+    }
+
     def __init__(self, driver: WebDriver, base_url: str):
         """
         Инициализация объекта SearchPage.
@@ -26,7 +33,7 @@ class SearchPage:
             driver (WebDriver): Экземпляр Selenium WebDriver.
             base_url (str): Базовый URL страницы поиска.
         """
-        self.driver = driver
+        super().__init__(driver)
         self.url = base_url
 
     @allure.step("Открыть главную страницу")
@@ -34,7 +41,7 @@ class SearchPage:
         """
         Открывает главную страницу поиска фильмов.
         """
-        self.driver.get(self.url)
+        self.navigate(self.url)
 
     @allure.step("Выполнить поиск по '{query}'")
     def search(self, query: str):
@@ -44,20 +51,23 @@ class SearchPage:
         Аргументы:
             query (str): Строка поискового запроса.
         """
-        search_field = self.driver.find_element(By.CSS_SELECTOR, "input[name='search']")
-        search_field.clear()
-        search_field.send_keys(query)
-        self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+        self.with_element("search_input", lambda el: (el.clear(), el.send_keys(query)))
+        self.click("submit")
 
     @allure.step("Получить названия найденных фильмов")
     def get_found_titles(self) -> list:
         """
         Получает список названий фильмов, найденных по поисковому запросу.
 
+        Ожидание завершается, как только появляется либо список результатов,
+        либо сообщение об отсутствии результатов.
+
         Возвращает:
-            list: Список названий фильмов.
+            list: Список названий фильмов, пустой если ничего не найдено.
         """
-        WebDriverWait(self.driver, 5).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, ".movie-title"))
+        found = self.waits.first_selector(
+            {"results": self.css("results"), "empty": self.css("empty_results")}
         )
-        return [el.text for el in self.driver.find_elements(By.CSS_SELECTOR, ".movie-title")]
+        if found != "results":
+            return []
+        return self.read_texts("results")
@@ -0,0 +1,228 @@
+"""
+Модуль ожиданий для PageObject-классов.
+
+Вместо WebDriverWait с фиксированным шагом опроса используется адаптивный опрос:
+первые проверки идут часто, затем интервал растёт. Ожидание появления элементов
+выполняется в браузере через MutationObserver, поэтому завершается сразу после
+изменения DOM, а ожидание «первого из» позволяет не ждать таймаут в негативных сценариях.
+"""
+
+import time
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_POLL = 0.05
+DEFAULT_MAX_POLL = 0.5
+DEFAULT_BACKOFF = 1.5
+
+# Браузер прерывает асинхронный скрипт по script timeout (по умолчанию 30 с),
+# поэтому длинные ожидания выполняются несколькими вызовами.
+_MAX_SCRIPT_WAIT = 25.0
+
+_IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+_WAIT_FOR_SELECTORS_JS = """
+const selectors = arguments[0];
+const visible = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+function match() {
+    for (const [name, selector] of Object.entries(selectors)) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (!visible || el.getClientRects().length > 0) {
+                return name;
+            }
+        }
+    }
+    return null;
+}
+const found = match();
+if (found !== null) {
+    done(found);
+    return;
+}
+let finished = false;
+let timer = null;
+const observer = new MutationObserver(() => {
+    const name = match();
+    if (name !== null) {
+        finish(name);
+    }
+});
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+timer = setTimeout(() => finish(null), timeoutMs);
+"""
+
+_defaults = {
+    "timeout": DEFAULT_TIMEOUT,
+    "poll": DEFAULT_POLL,
+    "max_poll": DEFAULT_MAX_POLL,
+    "backoff": DEFAULT_BACKOFF,
+}
+
+
+def configure(timeout: float = None, poll: float = None,
+              max_poll: float = None, backoff: float = None):
+    """
+    Меняет параметры ожиданий по умолчанию для всех страниц.
+
+    Аргументы:
+        timeout (float): Таймаут ожидания в секундах.
+        poll (float): Начальный интервал опроса в секундах.
+        max_poll (float): Максимальный интервал опроса в секундах.
+        backoff (float): Во сколько раз растёт интервал после каждой неудачной проверки.
+    """
+    for name, value in (("timeout", timeout), ("poll", poll),
+                        ("max_poll", max_poll), ("backoff", backoff)):
+        if value is not None:
+            _defaults[name] = value
+
+
+class PageWaits:
+    """
+    Набор ожиданий, привязанный к экземпляру WebDriver.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float = None, poll: float = None,
+                 max_poll: float = None, backoff: float = None):
+        """
+        Аргументы:
+            driver (WebDriver): Экземпляр Selenium WebDriver.
+            timeout (float): Таймаут по умолчанию; если не задан, берётся из configure().
+            poll (float): Начальный интервал опроса.
+            max_poll (float): Максимальный интервал опроса.
+            backoff (float): Множитель роста интервала опроса.
+        """
+        self.driver = driver
+        self.timeout = timeout if timeout is not None else _defaults["timeout"]
+        self.poll = poll if poll is not None else _defaults["poll"]
+        self.max_poll = max_poll if max_poll is not None else _defaults["max_poll"]
+        self.backoff = backoff if backoff is not None else _defaults["backoff"]
+
+    def _intervals(self, timeout: float):
+        """
+        Генерирует паузы между проверками, пока не истечёт timeout.
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.poll
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            yield min(interval, remaining)
+            interval = min(interval * self.backoff, self.max_poll)
+
+    def until(self, condition, timeout: float = None, message: str = ""):
+        """
+        Ждёт, пока condition(driver) не вернёт истинное значение.
+
+        Аргументы:
+            condition (Callable[[WebDriver], Any]): Условие, например из expected_conditions.
+            timeout (float): Таймаут в секундах; по умолчанию таймаут экземпляра.
+            message (str): Текст исключения при истечении таймаута.
+
+        Возвращает:
+            Any: Значение, которое вернуло условие.
+
+        Исключения:
+            TimeoutException: Если условие не выполнилось за timeout.
+        """
+        _, value = self.first_of({"value": condition}, timeout, message)
+        return value
+
+    def first_of(self, conditions: dict, timeout: float = None, message: str = ""):
+        """
+        Ждёт выполнения любого из условий и возвращает первое сработавшее.
+
+        Аргументы:
+            conditions (dict): Условия по именам.
+            timeout (float): Таймаут в секундах; по умолчанию таймаут экземпляра.
+            message (str): Текст исключения при истечении таймаута.
+
+        Возвращает:
+            tuple: Имя сработавшего условия и его значение.
+
+        Исключения:
+            TimeoutException: Если ни одно условие не выполнилось за timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        intervals = self._intervals(timeout)
+        while True:
+            for name, condition in conditions.items():
+                try:
+                    value = condition(self.driver)
+                except _IGNORED_EXCEPTIONS:
+                    continue
+                if value:
+                    return name, value
+            pause = next(intervals, None)
+            if pause is None:
+                raise TimeoutException(message or f"Ни одно из условий {list(conditions)} "
+                                                  f"не выполнилось за {timeout} с")
+            time.sleep(pause)
+
+    def first_selector(self, selectors: dict, timeout: float = None, visible: bool = True):
+        """
+        Ждёт в браузере появления элемента по любому из CSS-селекторов.
+
+        Ожидание выполняется одним асинхронным скриптом с MutationObserver и завершается
+        сразу после появления подходящего элемента. Если скрипт прерван (например,
+        переходом на другую страницу), ожидание продолжается адаптивным опросом.
+
+        Аргументы:
+            selectors (dict): CSS-селекторы по именам.
+            timeout (float): Таймаут в секундах; по умолчанию таймаут экземпляра.
+            visible (bool): Учитывать только отображаемые элементы.
+
+        Возвращает:
+            str: Имя сработавшего селектора или None, если за timeout ничего не появилось.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            chunk = min(remaining, _MAX_SCRIPT_WAIT)
+            try:
+                found = self.driver.execute_async_script(
+                    _WAIT_FOR_SELECTORS_JS, selectors, visible, int(chunk * 1000)
+                )
+            except WebDriverException:
+                return self._poll_selectors(selectors, deadline - time.monotonic(), visible)
+            if found is not None:
+                return found
+
+    def _poll_selectors(self, selectors: dict, timeout: float, visible: bool):
+        def matcher(selector):
+            def condition(driver):
+                elements = driver.find_elements("css selector", selector)
+                return any(el.is_displayed() for el in elements) if visible else bool(elements)
+            return condition
+
+        try:
+            name, _ = self.first_of(
+                {name: matcher(selector) for name, selector in selectors.items()},
+                max(timeout, 0),
+            )
+            return name
+        except TimeoutException:
+            return None
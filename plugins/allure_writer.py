@@ -0,0 +1,333 @@
+"""
+Плагин pytest для фоновой записи результатов Allure.
+
+При запуске с --alluredir стандартная запись результатов заменяется очередью
+и отдельным потоком записи: тест только кладёт в очередь результат или вложение,
+а сериализация, хэширование, сжатие и запись на диск выполняются в фоне.
+- Вложения с одинаковым содержимым записываются один раз: имя файла строится
+  по SHA-256 содержимого, ссылки в результатах тестов переписываются на него.
+- Вложения больше compress_min_size байт сохраняются в gzip с типом application/gzip,
+  кроме форматов, которые Allure показывает прямо в отчёте (HTML, текст, JSON и др.):
+  они записываются как есть, чтобы их можно было открыть без скачивания.
+- Скриншот и HTML страницы прикладываются только к упавшим UI-тестам.
+Параметры задаются в секции [allure] файла config.ini; при async_writer = false
+используется стандартная синхронная запись allure-pytest.
+При запуске через pytest-xdist записью занимаются воркеры, а контроллер выводит
+сводку, сложив их счётчики.
+"""
+
+import configparser
+import gzip
+import hashlib
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+import allure
+import allure_commons
+import pytest
+from allure_commons.logger import AllureFileLogger
+
+CONFIG_PATH = 'config/config.ini'
+GZIP_TYPE = 'application/gzip'
+# Расширения уже сжатых форматов: повторное сжатие только тратит время.
+INCOMPRESSIBLE = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'webm', 'mp4', 'zip', 'gz'}
+# Форматы, которые Allure отображает во встроенном просмотре; сжатый файл он только скачивает.
+RENDERED = {'html', 'htm', 'txt', 'log', 'json', 'xml', 'csv', 'tsv', 'svg', 'uri'}
+# Ключ workeroutput, в котором воркер xdist передаёт счётчики записи контроллеру.
+STATS_KEY = 'allure_writer_stats'
+_STOP = object()
+
+
+def _settings() -> configparser.SectionProxy:
+    parser = configparser.ConfigParser()
+    parser.read(CONFIG_PATH)
+    if not parser.has_section('allure'):
+        parser.add_section('allure')
+    return parser['allure']
+
+
+def _walk_attachments(item):
+    """
+    Перебирает вложения результата теста, контейнера фикстур или глобальных данных
+    вместе с вложениями всех шагов.
+    """
+    for attachment in getattr(item, 'attachments', None) or ():
+        yield attachment
+    for name in ('steps', 'befores', 'afters'):
+        for child in getattr(item, name, None) or ():
+            yield from _walk_attachments(child)
+
+
+class AsyncAllureLogger:
+    """
+    Обработчик хуков allure_commons, записывающий результаты Allure в фоновом потоке.
+
+    Результаты записывает исходный AllureFileLogger через его хуки report_result,
+    report_container и report_globals, поэтому формат файлов не меняется.
+    Вложения сообщаются раньше результатов, к которым они относятся, а очередь
+    обрабатывается по порядку, поэтому к записи результата имена файлов вложений уже известны.
+    """
+
+    def __init__(self, file_logger: AllureFileLogger, report_dir: str, queue_size: int = 1000,
+                 compress_min_size: int = 64 * 1024):
+        """
+        Инициализация и запуск потока записи.
+
+        Аргументы:
+            file_logger (AllureFileLogger): Стандартный обработчик, выполняющий запись результатов.
+            report_dir (str): Каталог результатов Allure (опция --alluredir).
+            queue_size (int): Максимальная длина очереди; при переполнении тест ждёт.
+            compress_min_size (int): Минимальный размер сжимаемого вложения в байтах; 0 — не сжимать.
+        """
+        self.file_logger = file_logger
+        self.report_dir = Path(report_dir).absolute()
+        self.compress_min_size = compress_min_size
+        self.stats = {
+            'results': 0, 'attachments': 0, 'deduplicated': 0, 'compressed': 0,
+            'bytes_in': 0, 'bytes_written': 0, 'max_queue': 0, 'errors': 0,
+        }
+        self.last_error = None
+        self.flush_seconds = None
+        self._sources = {}
+        self._by_digest = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='allure-writer', daemon=True)
+        self._thread.start()
+
+    def _put(self, kind: str, *payload):
+        self._queue.put((kind, payload))
+        depth = self._queue.qsize()
+        if depth > self.stats['max_queue']:
+            self.stats['max_queue'] = depth
+
+    @allure_commons.hookimpl
+    def report_result(self, result):
+        self._put('item', self.file_logger.report_result, result)
+
+    @allure_commons.hookimpl
+    def report_container(self, container):
+        self._put('item', self.file_logger.report_container, container)
+
+    @allure_commons.hookimpl
+    def report_globals(self, globals_item):
+        self._put('item', self.file_logger.report_globals, globals_item)
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        self._put('data', body, file_name)
+
+    @allure_commons.hookimpl
+    def report_attached_file(self, source, file_name):
+        # Файл читается потоком записи, поэтому он должен существовать до конца сессии.
+        self._put('file', source, file_name)
+
+    def close(self, timeout: float = 60):
+        """
+        Дожидается записи всех результатов из очереди и останавливает поток.
+        """
+        self._queue.put((_STOP, ()))
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            kind, payload = self._queue.get()
+            if kind is _STOP:
+                return
+            try:
+                if kind == 'item':
+                    self._write_item(*payload)
+                elif kind == 'data':
+                    body, file_name = payload
+                    self._write_attachment(body.encode('utf-8') if isinstance(body, str) else body,
+                                           file_name)
+                else:
+                    source, file_name = payload
+                    with open(source, 'rb') as f:
+                        self._write_attachment(f.read(), file_name)
+            except Exception as e:
+                # Ошибка записи одного файла не должна останавливать запись остальных.
+                self.stats['errors'] += 1
+                self.last_error = repr(e)
+
+    def _write_item(self, report, item):
+        for attachment in _walk_attachments(item):
+            stored = self._sources.get(attachment.source)
+            if stored is not None:
+                attachment.source, compressed = stored
+                if compressed:
+                    attachment.type = GZIP_TYPE
+        report(item)
+        self.stats['results'] += 1
+
+    def _write_attachment(self, data: bytes, file_name: str):
+        self.stats['attachments'] += 1
+        self.stats['bytes_in'] += len(data)
+        extension = file_name.rsplit('.', 1)[1].lower() if '.' in file_name else 'attach'
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        known = self._by_digest.get((digest, extension))
+        if known is not None:
+            self._sources[file_name] = known
+            self.stats['deduplicated'] += 1
+            return
+        compressed = False
+        if self.compress_min_size and len(data) >= self.compress_min_size \
+                and extension not in INCOMPRESSIBLE and extension not in RENDERED:
+            packed = gzip.compress(data, compresslevel=6, mtime=0)
+            if len(packed) < len(data) * 0.9:
+                data, compressed = packed, True
+                self.stats['compressed'] += 1
+        name = f"{digest}-attachment.{extension}{'.gz' if compressed else ''}"
+        self._sources[file_name] = self._by_digest[(digest, extension)] = (name, compressed)
+        final_path = self.report_dir / name
+        # Воркеры xdist пишут в общий каталог, поэтому проверяется и наличие файла.
+        if final_path.exists():
+            self.stats['deduplicated'] += 1
+            return
+        tmp_path = self.report_dir / f"{name}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, final_path)
+        self.stats['bytes_written'] += len(data)
+
+
+def _find_file_logger():
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        if isinstance(plugin, AllureFileLogger):
+            return plugin
+    return None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    if not getattr(config.option, 'allure_report_dir', None):
+        return
+    settings = _settings()
+    config._allure_failure_screenshot = settings.getboolean('failure_screenshot', True)
+    config._allure_failure_page_source = settings.getboolean('failure_page_source', True)
+    if not settings.getboolean('async_writer', True):
+        return
+    file_logger = _find_file_logger()
+    if file_logger is None:
+        return
+    name = allure_commons.plugin_manager.get_name(file_logger)
+    allure_commons.plugin_manager.unregister(file_logger)
+    writer = AsyncAllureLogger(
+        file_logger,
+        config.option.allure_report_dir,
+        queue_size=settings.getint('queue_size', 1000),
+        compress_min_size=settings.getint('compress_min_size', 64 * 1024),
+    )
+    allure_commons.plugin_manager.register(writer)
+    config._allure_writer = (writer, file_logger, name)
+
+
+def _find_driver(item):
+    """
+    Ищет драйвер среди фикстур теста, включая полученные через request.getfixturevalue(),
+    чтобы плагин не зависел от Selenium.
+    """
+    values = list(item.funcargs.values())
+    request = getattr(item, '_request', None)
+    if request is not None:
+        # К моменту отчёта о вызове все фикстуры теста уже подготовлены и берутся из кэша.
+        for name in request.fixturenames:
+            if name not in item.funcargs and name != 'request':
+                try:
+                    values.append(request.getfixturevalue(name))
+                except Exception:
+                    continue
+    return next((value for value in values
+                 if callable(getattr(value, 'get_screenshot_as_png', None))), None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != 'call' or not report.failed:
+        return
+    if not getattr(item.config, '_allure_failure_screenshot', False) \
+            and not getattr(item.config, '_allure_failure_page_source', False):
+        return
+    driver = _find_driver(item)
+    if driver is None:
+        return
+    try:
+        if item.config._allure_failure_screenshot:
+            allure.attach(driver.get_screenshot_as_png(), name="Скриншот при падении",
+                          attachment_type=allure.attachment_type.PNG)
+        if item.config._allure_failure_page_source:
+            allure.attach(driver.page_source, name="HTML страницы при падении",
+                          attachment_type=allure.attachment_type.HTML)
+    except Exception as e:
+        # Браузер мог уже закрыться; причина падения теста важнее диагностики.
+        allure.attach(str(e), name="Не удалось снять диагностику",
+                      attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    # Итоговая сводка выводится после этого хука, поэтому к ней очередь уже записана.
+    state = getattr(session.config, '_allure_writer', None)
+    if state is None or state[0].flush_seconds is not None:
+        return
+    writer, file_logger, name = state
+    started = time.perf_counter()
+    writer.close()
+    writer.flush_seconds = time.perf_counter() - started
+    allure_commons.plugin_manager.unregister(writer)
+    # allure-pytest при завершении снимает с регистрации свой обработчик по объекту.
+    allure_commons.plugin_manager.register(file_logger, name)
+    if hasattr(session.config, 'workerinput'):
+        session.config.workeroutput[STATS_KEY] = dict(
+            writer.stats, flush_seconds=writer.flush_seconds, last_error=writer.last_error)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    stats = getattr(node, 'workeroutput', {}).get(STATS_KEY)
+    if stats is not None:
+        node.config._allure_worker_stats = getattr(node.config, '_allure_worker_stats', []) + [stats]
+
+
+def _total_stats(config):
+    """
+    Складывает счётчики записи этого процесса и воркеров xdist.
+    Возвращает None, если запись не выполнялась ни в одном процессе.
+    """
+    state = getattr(config, '_allure_writer', None)
+    parts = list(getattr(config, '_allure_worker_stats', []))
+    if state is not None:
+        parts.append(dict(state[0].stats, flush_seconds=state[0].flush_seconds,
+                          last_error=state[0].last_error))
+    parts = [part for part in parts if part['results'] or part['attachments'] or part['errors']]
+    if not parts:
+        return None
+    total = {key: sum(part[key] for part in parts)
+             for key in ('results', 'attachments', 'deduplicated', 'compressed',
+                         'bytes_in', 'bytes_written', 'errors')}
+    total['max_queue'] = max(part['max_queue'] for part in parts)
+    total['flush_seconds'] = max(part['flush_seconds'] or 0 for part in parts)
+    total['last_error'] = next(
+        (part['last_error'] for part in reversed(parts) if part['last_error']), None)
+    return total
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    stats = _total_stats(config)
+    if stats is None:
+        return
+    terminalreporter.section('allure writer')
+    terminalreporter.write_line(
+        f"Результатов: {stats['results']}, вложений: {stats['attachments']} "
+        f"(повторов: {stats['deduplicated']}, сжато: {stats['compressed']}), "
+        f"записано {stats['bytes_written'] / 1024:.1f} КиБ из {stats['bytes_in'] / 1024:.1f} КиБ, "
+        f"наибольшая очередь: {stats['max_queue']}, "
+        f"ожидание записи в конце сессии: {stats['flush_seconds']:.2f} с"
+    )
+    if stats['errors']:
+        terminalreporter.write_line(
+            f"Ошибок записи: {stats['errors']}, последняя: {stats['last_error']}", red=True)
@@ -0,0 +1,281 @@
+"""
+Плагин pytest для сравнения времени тестов и шагов с сохранённым эталоном.
+
+Опция --perf-baseline=update добавляет замеры текущего запуска в файл эталона
+(по умолчанию config/perf_baseline.json), --perf-baseline=compare сравнивает с ним.
+Замеры шагов собирает плагин plugins.timing.
+
+Для каждого теста сравниваются длительность вызова теста и длительности его шагов.
+Регрессией считается рост медианы больше порога threshold, подтверждённый
+статистически: U-критерием Манна — Уитни, если в запуске набралось min_samples
+замеров, иначе выходом всех замеров за 95-й перцентиль эталона.
+За один запуск тест даёт один замер, поэтому для U-критерия тест нужно повторить:
+опция --perf-repeat=N выполняет каждый тест N раз, и замеры повторов сравниваются
+с эталоном вместе после последнего повтора. Шаги, вызываемые в тесте несколько раз,
+дают несколько замеров и без повторов.
+Параметры задаются в секции [perf_baseline] файла config.ini; при fail_on_regression = true
+регрессировавшие тесты помечаются упавшими, иначе попадают только в итоговую сводку.
+"""
+
+import configparser
+import json
+import math
+import re
+import statistics
+
+import pytest
+
+from plugins import timing
+from utils.file_lock import file_lock
+
+CONFIG_PATH = 'config/config.ini'
+BASELINE_PATH = 'config/perf_baseline.json'
+REGRESSION_PROPERTY = 'perf_regression'
+REPEAT_PARAM = '_perf_repeat'
+_REPEAT_ID = re.compile(r'perf\d+of\d+')
+
+
+def _settings() -> configparser.SectionProxy:
+    parser = configparser.ConfigParser()
+    parser.read(CONFIG_PATH)
+    if not parser.has_section('perf_baseline'):
+        parser.add_section('perf_baseline')
+    return parser['perf_baseline']
+
+
+def mann_whitney_greater(current: list, baseline: list) -> float:
+    """
+    Односторонний U-критерий Манна — Уитни в нормальном приближении.
+
+    Аргументы:
+        current (list): Замеры текущего запуска.
+        baseline (list): Замеры эталона.
+
+    Возвращает:
+        float: p-значение гипотезы «замеры текущего запуска больше эталонных».
+    """
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        i = j + 1
+    n1, n2 = len(current), len(baseline)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(current: list, baseline: list, threshold: float = 0.2, alpha: float = 0.05,
+            min_samples: int = 5):
+    """
+    Проверяет, замедлились ли замеры относительно эталона.
+
+    Аргументы:
+        current (list): Замеры текущего запуска, мс.
+        baseline (list): Замеры эталона, мс.
+        threshold (float): Допустимый относительный рост медианы.
+        alpha (float): Уровень значимости U-критерия.
+        min_samples (int): Минимальное число замеров для статистического сравнения.
+
+    Возвращает:
+        dict | None: Описание регрессии или None, если её нет или эталона недостаточно.
+    """
+    if not current or len(baseline) < min_samples:
+        return None
+    baseline_median = statistics.median(baseline)
+    current_median = statistics.median(current)
+    if baseline_median <= 0 or current_median <= baseline_median * (1 + threshold):
+        return None
+    p_value = None
+    if len(current) >= min_samples:
+        p_value = mann_whitney_greater(current, baseline)
+        if p_value >= alpha:
+            return None
+    elif min(current) <= timing.percentile(sorted(baseline), 95):
+        return None
+    return {
+        "baseline_ms": round(baseline_median, 3),
+        "current_ms": round(current_median, 3),
+        "ratio": round(current_median / baseline_median, 3),
+        "p_value": None if p_value is None else round(p_value, 4),
+    }
+
+
+class Baseline:
+    """
+    Файл эталонных замеров: последние max_samples значений для каждого ключа.
+    """
+
+    def __init__(self, path: str = BASELINE_PATH, max_samples: int = 50):
+        self.path = path
+        self.max_samples = max_samples
+        self.samples = self._read()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f).get('samples', {})
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key: str) -> list:
+        return self.samples.get(key, [])
+
+    def update(self, new_samples: dict):
+        """
+        Добавляет замеры в файл эталона. Файл перечитывается под блокировкой,
+        поэтому замеры нескольких воркеров xdist не теряются.
+
+        Аргументы:
+            new_samples (dict): Списки замеров по ключам.
+        """
+        with file_lock(self.path + '.lock'):
+            self.samples = self._read()
+            for key, values in new_samples.items():
+                merged = self.samples.get(key, []) + [round(value, 3) for value in values]
+                self.samples[key] = merged[-self.max_samples:]
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'samples': self.samples}, f, ensure_ascii=False, indent=1,
+                          sort_keys=True)
+
+
+def key_for_test(nodeid: str) -> str:
+    # Повторы --perf-repeat дают один ключ: из идентификатора теста убираются номер повтора
+    # и суффикс группы, который xdist добавляет при --dist loadgroup.
+    nodeid = nodeid.split('@perf::', 1)[0]
+    if nodeid.endswith(']'):
+        name, _, params = nodeid[:-1].partition('[')
+        params = '-'.join(part for part in params.split('-') if not _REPEAT_ID.fullmatch(part))
+        nodeid = f"{name}[{params}]" if params else name
+    return f"test::{nodeid}"
+
+
+def key_for_step(step: str) -> str:
+    return f"step::{step}"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('kinopoisk')
+    group.addoption(
+        '--perf-baseline', choices=('compare', 'update'), default=None,
+        help='compare — сравнить время тестов и шагов с эталоном; '
+             'update — сравнить и добавить замеры запуска в эталон.'
+    )
+    group.addoption(
+        '--perf-baseline-file', default=BASELINE_PATH,
+        help='Файл эталонных замеров времени.'
+    )
+    group.addoption(
+        '--perf-repeat', type=int, default=1, metavar='N',
+        help='Выполнить каждый тест N раз, чтобы сравнивать с эталоном по N замерам.'
+    )
+
+
+def pytest_generate_tests(metafunc):
+    count = metafunc.config.getoption('--perf-repeat')
+    if count <= 1 or not metafunc.config.getoption('--perf-baseline'):
+        return
+    # Группа xdist держит повторы теста на одном воркере при --dist loadgroup.
+    group = pytest.mark.xdist_group(f"perf::{metafunc.definition.nodeid}")
+    metafunc.fixturenames.append(REPEAT_PARAM)
+    metafunc.parametrize(REPEAT_PARAM, [
+        pytest.param(number, id=f"perf{number + 1}of{count}", marks=group)
+        for number in range(count)
+    ])
+
+
+def pytest_configure(config):
+    mode = config.getoption('--perf-baseline')
+    if not mode:
+        return
+    settings = _settings()
+    config._perf_baseline = Baseline(config.getoption('--perf-baseline-file'),
+                                     settings.getint('max_samples', 50))
+    config._perf_baseline_settings = {
+        'threshold': settings.getfloat('threshold', 0.2),
+        'alpha': settings.getfloat('alpha', 0.05),
+        'min_samples': settings.getint('min_samples', 5),
+    }
+    config._perf_baseline_fail = settings.getboolean('fail_on_regression', False)
+    config._perf_samples = {}
+    config._perf_pending = {}
+    timing.enable(config)
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    baseline = getattr(item.config, '_perf_baseline', None)
+    report = outcome.get_result()
+    if baseline is None or report.when != 'call' or not report.passed:
+        return
+    test_key = key_for_test(item.nodeid)
+    current = item.config._perf_pending.setdefault(test_key, {})
+    new_samples = {test_key: [report.duration * 1000]}
+    for step, durations in item.config._perf_recorder.step_samples(item.nodeid).items():
+        new_samples[key_for_step(step)] = durations
+    for key, values in new_samples.items():
+        item.config._perf_samples.setdefault(key, []).extend(values)
+        current.setdefault(key, []).extend(values)
+    callspec = getattr(item, 'callspec', None)
+    repeat = callspec.params.get(REPEAT_PARAM) if callspec is not None else None
+    if repeat is not None and repeat < item.config.getoption('--perf-repeat') - 1:
+        # Замеры повторов сравниваются вместе после последнего повтора.
+        return
+    del item.config._perf_pending[test_key]
+    regressions = []
+    for key, values in current.items():
+        result = compare(values, baseline.get(key), **item.config._perf_baseline_settings)
+        if result is not None:
+            regressions.append(dict(result, key=key))
+    if not regressions:
+        return
+    report.user_properties.append((REGRESSION_PROPERTY, regressions))
+    if item.config._perf_baseline_fail and item.config.getoption('--perf-baseline') == 'compare':
+        report.outcome = 'failed'
+        report.longrepr = "Время выполнения выросло относительно эталона:\n" + "\n".join(
+            _format(regression) for regression in regressions
+        )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if getattr(config, '_perf_baseline', None) is None:
+        return
+    # Отчёты воркеров xdist приходят с user_properties, поэтому сводка собирается по ним.
+    regressions = [
+        (report.nodeid, regression)
+        for reports in terminalreporter.stats.values() for report in reports
+        if getattr(report, 'when', None) == 'call'
+        for name, value in getattr(report, 'user_properties', ()) if name == REGRESSION_PROPERTY
+        for regression in value
+    ]
+    terminalreporter.section('perf baseline')
+    if not regressions:
+        terminalreporter.write_line('Регрессий времени выполнения не найдено.')
+        return
+    for nodeid, regression in regressions:
+        terminalreporter.write_line(f"{nodeid}: {_format(regression)}")
+
+
+def pytest_unconfigure(config):
+    baseline = getattr(config, '_perf_baseline', None)
+    if baseline is None or config.getoption('--perf-baseline') != 'update':
+        return
+    if config._perf_samples:
+        baseline.update(config._perf_samples)
+
+
+def _format(regression: dict) -> str:
+    p_value = regression['p_value']
+    significance = f", p={p_value}" if p_value is not None else ", выше p95 эталона"
+    return (f"{regression['key']}: {regression['baseline_ms']} → {regression['current_ms']} мс "
+            f"(×{regression['ratio']}{significance})")
@@ -0,0 +1,144 @@
+"""
+Фикстуры браузера Chrome для UI-тестов:
+- Настройка и завершение сессии браузера Chrome для автотестов:
+  отдельный браузер на тест, пул «тёплых» браузеров или изолированные контексты
+  одного Chrome (опция --browser-mode);
+- Авторизованный браузер с повторным использованием cookies и localStorage.
+
+Модули Selenium и webdriver_manager импортируются внутри фикстур, поэтому
+запуск только API-тестов не тратит время на их загрузку.
+"""
+
+import functools
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def chromedriver_path(config):
+    """
+    Определяет путь к chromedriver один раз за сессию.
+    В офлайн-режиме используется закреплённый путь chromedriver_path из секции [ui].
+    """
+    from browser.driver_factory import resolve_chromedriver
+
+    return resolve_chromedriver(
+        pinned_path=config['ui'].get('chromedriver_path') or None,
+        offline=config['ui'].getboolean('offline', False),
+    )
+
+
+@pytest.fixture(scope='session')
+def chrome_factory(config, chromedriver_path):
+    """
+    Функция запуска Chrome с настройками сессии.
+    Облегчённый режим загрузки страниц включается в секции [lean].
+    """
+    from browser.driver_factory import create_chrome
+    from browser.lean import LeanProfile
+
+    lean_profile = None
+    if config.has_section('lean') and config['lean'].getboolean('enabled', False):
+        section = config['lean']
+        lean_profile = LeanProfile(
+            block_types=[t.strip() for t in section.get('block_types', '').split(',') if t.strip()],
+            block_urls=[u.strip() for u in section.get('block_urls', '').split(',') if u.strip()],
+            page_load_strategy=section.get('page_load_strategy', 'eager'),
+        )
+    return functools.partial(create_chrome, chromedriver_path, lean_profile=lean_profile)
+
+
+@pytest.fixture(scope='session')
+def browser_pool(config, chrome_factory):
+    """
+    Пул headless-браузеров Chrome на всю сессию (на каждый воркер xdist свой).
+    Размер пула и число тестов до пересоздания браузера задаются в секции [ui].
+    """
+    from browser.pool import DriverPool
+
+    pool = DriverPool(
+        chrome_factory,
+        size=config['ui'].getint('pool_size', 1),
+        max_uses=config['ui'].getint('pool_max_uses', 20),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope='session')
+def context_pool(config, chrome_factory):
+    """
+    Пул изолированных контекстов одного Chrome на всю сессию (на каждый воркер xdist свой).
+    Число одновременно открытых контекстов и время загрузки страницы задаются
+    параметрами context_pool_size и page_load_timeout секции [ui].
+    """
+    from browser.contexts import ContextPool
+
+    pool = ContextPool(
+        chrome_factory,
+        size=config['ui'].getint('context_pool_size', 8),
+        page_load_timeout=config['ui'].getfloat('page_load_timeout', 30),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope='session')
+def ui_waits(config):
+    """
+    Применяет параметры ожиданий PageObject-классов из секции [ui].
+    """
+    from pages import waits
+
+    waits.configure(
+        timeout=config['ui'].getfloat('wait_timeout', waits.DEFAULT_TIMEOUT),
+        poll=config['ui'].getfloat('wait_poll', waits.DEFAULT_POLL),
+        max_poll=config['ui'].getfloat('wait_max_poll', waits.DEFAULT_MAX_POLL),
+    )
+
+
+@pytest.fixture
+def browser(request, ui_base_url, ui_waits):
+    """
+    Выдаёт браузер Chrome в headless-режиме на время теста.
+
+    В режиме pooled браузер берётся из пула и после теста очищается и возвращается в него,
+    в режиме isolated запускается отдельный браузер, который закрывается после теста,
+    в режиме contexts тест получает новый изолированный контекст общего Chrome.
+    Параметры ожиданий PageObject-классов берутся из секции [ui] (фикстура ui_waits).
+    """
+    mode = request.config.getoption('--browser-mode')
+    if mode == 'isolated':
+        driver = request.getfixturevalue('chrome_factory')()
+        yield driver
+        driver.quit()
+        return
+    pool = request.getfixturevalue('context_pool' if mode == 'contexts' else 'browser_pool')
+    driver = pool.acquire()
+    yield driver
+    pool.release(driver)
+
+
+@pytest.fixture(scope='session')
+def auth_state_cache(config, ui_base_url):
+    """
+    Кэш состояний авторизации на всю сессию: вход через форму выполняется
+    один раз для каждого пользователя.
+    """
+    from browser.auth_state import AuthStateCache
+
+    return AuthStateCache(
+        ui_base_url,
+        max_age=config['ui'].getfloat('auth_state_max_age', 30 * 60),
+    )
+
+
+@pytest.fixture
+def logged_in_browser(browser, auth_state_cache, test_data):
+    """
+    Браузер с авторизованным пользователем valid_email из тестовых данных.
+    """
+    assert auth_state_cache.login(
+        browser, test_data['valid_email'], test_data['valid_password']
+    ), "Не удалось авторизоваться"
+    return browser
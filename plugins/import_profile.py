@@ -0,0 +1,142 @@
+"""
+Плагин pytest для поиска самых медленных импортов при сборе тестов.
+
+Опция --import-profile=N выводит в итоговой сводке N модулей с наибольшим временем
+импорта (собственным и вместе с вложенными импортами) и общее время сбора тестов.
+Без дополнительных параметров замер начинается после загрузки conftest.py;
+чтобы учесть и импорты conftest.py, плагин нужно подключить заранее:
+
+    pytest tests/test_api.py -p plugins.import_profile --import-profile=15
+"""
+
+import sys
+import time
+
+import pytest
+
+
+class _TimedLoader:
+    """
+    Обёртка загрузчика модуля, замеряющая выполнение кода модуля.
+    """
+
+    def __init__(self, loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.leave(module.__name__)
+
+
+class ImportProfiler:
+    """
+    Искатель модулей для sys.meta_path, который замеряет время импорта каждого модуля.
+    """
+
+    def __init__(self):
+        self.cumulative = {}
+        self.self_time = {}
+        self._stack = []
+        self._finding = False
+        self.started = None
+        self.stopped = None
+
+    def find_spec(self, name, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name: str):
+        started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.cumulative[name] = elapsed
+        self.self_time[name] = elapsed - children
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def start(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+            self.started = time.perf_counter()
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+            self.stopped = time.perf_counter()
+
+    def slowest(self, limit: int) -> list:
+        """
+        Возвращает модули с наибольшим временем импорта вместе с вложенными импортами.
+
+        Возвращает:
+            list: Кортежи (модуль, собственное время, время с вложенными импортами) в секундах.
+        """
+        names = sorted(self.cumulative, key=self.cumulative.get, reverse=True)[:limit]
+        return [(name, self.self_time[name], self.cumulative[name]) for name in names]
+
+
+_profiler = ImportProfiler()
+
+
+def pytest_addoption(parser):
+    parser.getgroup('kinopoisk').addoption(
+        '--import-profile', type=int, default=0, metavar='N',
+        help='Показать N самых медленных импортов при сборе тестов.'
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    if any(arg.startswith('--import-profile') for arg in args):
+        _profiler.start()
+
+
+def pytest_configure(config):
+    if config.getoption('--import-profile'):
+        _profiler.start()
+
+
+def pytest_collection_finish(session):
+    _profiler.stop()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    limit = config.getoption('--import-profile')
+    if not limit or _profiler.started is None:
+        return
+    terminalreporter.section('import profile')
+    stopped = _profiler.stopped or time.perf_counter()
+    terminalreporter.write_line(
+        f"Импорт и сбор тестов: {stopped - _profiler.started:.3f} с, "
+        f"импортировано модулей: {len(_profiler.cumulative)}"
+    )
+    terminalreporter.write_line(f"{'собств., мс':>12} {'всего, мс':>10}  модуль")
+    for name, own, total in _profiler.slowest(limit):
+        terminalreporter.write_line(f"{own * 1000:12.1f} {total * 1000:10.1f}  {name}")
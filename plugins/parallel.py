@@ -0,0 +1,124 @@
+"""
+Плагин pytest для параллельного запуска тестов через pytest-xdist.
+
+- Упорядочивает тесты по оценке стоимости (UI дороже API), чтобы при
+  раздаче воркерам длинные тесты стартовали первыми;
+- Читает тестовые данные один раз на контроллере и передаёт их воркерам;
+- Подбирает число воркеров для -n auto по ядрам и доступной памяти,
+  так как каждый UI-воркер держит свой Chrome.
+
+Общий для всех воркеров лимит запросов к API задаётся параметром rate_limit
+в секции [api] файла config.ini, см. api.rate_limit.RateLimiter.
+"""
+
+import configparser
+import json
+import os
+
+import pytest
+
+CONFIG_PATH = 'config/config.ini'
+TEST_DATA_PATH = 'config/test_data.json'
+WORKERINPUT_KEY = 'kinopoisk_test_data'
+
+
+def _settings() -> configparser.SectionProxy:
+    parser = configparser.ConfigParser()
+    parser.read(CONFIG_PATH)
+    if not parser.has_section('parallel'):
+        parser.add_section('parallel')
+    return parser['parallel']
+
+
+def _available_memory_mb():
+    """
+    Возвращает объём доступной памяти в МБ или None, если его не удалось определить.
+    """
+    try:
+        with open('/proc/meminfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def recommended_workers(browser_memory_mb: int) -> int:
+    """
+    Оценивает число воркеров, которое выдержит машина.
+
+    Аргументы:
+        browser_memory_mb (int): Память, занимаемая одним воркером с браузером, в МБ.
+
+    Возвращает:
+        int: Число воркеров, не больше числа доступных ядер.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    memory = _available_memory_mb()
+    if memory is None:
+        return cpus
+    return max(1, min(cpus, memory // browser_memory_mb))
+
+
+def shared_test_data(config):
+    """
+    Возвращает тестовые данные, переданные контроллером xdist, или None вне воркера.
+
+    Аргументы:
+        config (pytest.Config): Конфигурация pytest.
+    """
+    workerinput = getattr(config, 'workerinput', None)
+    if workerinput and WORKERINPUT_KEY in workerinput:
+        return json.loads(workerinput[WORKERINPUT_KEY])
+    return None
+
+
+def estimated_cost(item, settings) -> float:
+    """
+    Оценивает относительную стоимость теста.
+
+    Явная оценка задаётся маркером @pytest.mark.cost(n); иначе тест,
+    использующий фикстуру browser, считается UI-тестом.
+    """
+    marker = item.get_closest_marker('cost')
+    if marker is not None and marker.args:
+        return float(marker.args[0])
+    if 'browser' in getattr(item, 'fixturenames', ()):
+        return settings.getfloat('ui_cost', 10)
+    return settings.getfloat('api_cost', 1)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'cost(n): относительная стоимость теста для распределения по воркерам'
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    if os.environ.get('PYTEST_XDIST_AUTO_NUM_WORKERS'):
+        return None
+    return recommended_workers(_settings().getint('browser_memory_mb', 300))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    try:
+        with open(TEST_DATA_PATH, encoding='utf-8') as f:
+            node.workerinput[WORKERINPUT_KEY] = f.read()
+    except OSError:
+        pass
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if not (getattr(config, 'workerinput', None) or config.getoption('numprocesses', None)):
+        return
+    settings = _settings()
+    items.sort(key=lambda item: estimated_cost(item, settings), reverse=True)
@@ -0,0 +1,457 @@
+"""
+Плагин pytest для замера времени шагов Allure.
+
+Включается опцией --perf-report=<каталог>. Каждый шаг (@allure.step и with allure.step)
+получает запись с временем выполнения, числом команд WebDriver и HTTP-запросов API,
+объёмом и временем HTTP-ответов. В конце сессии в каталог пишутся:
+- steps.json и steps.csv — сводка p50/p95/p99 по каждому шагу;
+- flame.txt — время шагов в формате свёрнутых стеков для flamegraph;
+- records.json — сырые замеры; при запуске через pytest-xdist каждый воркер пишет их
+  в свой подкаталог, а контроллер объединяет в общую сводку.
+Профиль шагов каждого теста дополнительно прикладывается к отчёту Allure.
+"""
+
+import contextlib
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import allure
+import allure_commons
+import pytest
+from allure_commons._allure import StepContext
+
+SUMMARY_FIELDS = (
+    "step", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+    "webdriver_commands", "http_requests", "http_bytes", "http_ms",
+)
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Вычисляет перцентиль с линейной интерполяцией.
+
+    Аргументы:
+        values (list): Отсортированные значения.
+        q (float): Перцентиль от 0 до 100.
+
+    Возвращает:
+        float: Значение перцентиля или 0.0 для пустого списка.
+    """
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+_STEP_ENTER = StepContext.__enter__.__code__
+
+
+def step_name(title: str) -> str:
+    """
+    Возвращает шаблон названия шага из @allure.step (например, "Поиск по '{query}'"),
+    чтобы вызовы одного шага с разными аргументами попадали в одну группу.
+
+    Хук start_step получает уже подставленное название, поэтому шаблон берётся
+    у декоратора: его обёртка вызывает StepContext.__enter__ вложенного шага.
+    Это внутреннее устройство allure-python: версия закреплена в requirements.txt,
+    а поведение — тестом tests/test_timing.py. Если устройство изменится,
+    step_templates_supported() вернёт False, при включении замеров выводится
+    предупреждение, а шаги группируются по полному названию.
+    Для шагов «with allure.step(...)» название и есть шаблон.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code is not _STEP_ENTER:
+        frame = frame.f_back
+    caller = frame.f_back if frame is not None else None
+    if caller is not None and caller.f_code.co_name == "impl":
+        decorator = caller.f_locals.get("self")
+        if isinstance(decorator, StepContext):
+            return decorator.title
+    return title
+
+
+class _TemplateProbe:
+    def __init__(self):
+        self.names = []
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.names.append(step_name(title))
+
+
+def step_templates_supported() -> bool:
+    """
+    Проверяет, что step_name() восстанавливает шаблон названия шага
+    в установленной версии allure-python.
+
+    Возвращает:
+        bool: True, если шаги с разными аргументами группируются по шаблону.
+    """
+    probe = _TemplateProbe()
+    allure_commons.plugin_manager.register(probe)
+    try:
+        allure.step("Шаг {value}")(lambda value: None)(0)
+    finally:
+        allure_commons.plugin_manager.unregister(probe)
+    return probe.names == ["Шаг {value}"]
+
+
+class _Frame:
+    __slots__ = ("name", "path", "recorded", "started", "children_ms",
+                 "webdriver_commands", "http_requests", "http_bytes", "http_ms")
+
+    def __init__(self, name: str, path: str, recorded: bool = True):
+        self.name = name
+        self.path = path
+        self.recorded = recorded
+        self.started = time.perf_counter()
+        self.children_ms = 0.0
+        self.webdriver_commands = 0
+        self.http_requests = 0
+        self.http_bytes = 0
+        self.http_ms = 0.0
+
+
+class StepRecorder:
+    """
+    Обработчик хуков allure_commons, собирающий замеры шагов.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.current_test = "<session>"
+        self._suspended = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        stack = self._stack()
+        name = step_name(title)
+        parent = stack[-1].path if stack else self.current_test
+        stack.append(_Frame(name, f"{parent};{name}", recorded=not self._suspended))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        stack = self._stack()
+        if not stack:
+            return
+        frame = stack.pop()
+        duration_ms = (time.perf_counter() - frame.started) * 1000
+        if stack:
+            stack[-1].children_ms += duration_ms
+        if not frame.recorded:
+            return
+        record = {
+            "test": self.current_test,
+            "step": frame.name,
+            "path": frame.path,
+            "duration_ms": duration_ms,
+            "self_ms": max(duration_ms - frame.children_ms, 0.0),
+            "webdriver_commands": frame.webdriver_commands,
+            "http_requests": frame.http_requests,
+            "http_bytes": frame.http_bytes,
+            "http_ms": frame.http_ms,
+            "failed": exc_type is not None,
+        }
+        with self._lock:
+            self.records.append(record)
+
+    @contextlib.contextmanager
+    def suspended(self):
+        """
+        Не записывает шаги, начатые внутри блока, во всех потоках.
+        """
+        with self._lock:
+            self._suspended += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._suspended -= 1
+
+    def count_webdriver_command(self):
+        """
+        Учитывает команду WebDriver во всех открытых шагах текущего потока.
+        """
+        for frame in self._stack():
+            frame.webdriver_commands += 1
+
+    def count_http(self, size: int, elapsed_ms: float):
+        """
+        Учитывает HTTP-ответ во всех открытых шагах текущего потока.
+        """
+        for frame in self._stack():
+            frame.http_requests += 1
+            frame.http_bytes += size
+            frame.http_ms += elapsed_ms
+
+    def step_samples(self, test: str = None) -> dict:
+        """
+        Возвращает длительности шагов в мс, сгруппированные по названию шага.
+
+        Аргументы:
+            test (str): Ограничить выборку одним тестом.
+        """
+        samples = defaultdict(list)
+        with self._lock:
+            for record in self.records:
+                if test is None or record["test"] == test:
+                    samples[record["step"]].append(record["duration_ms"])
+        return dict(samples)
+
+    def summary(self) -> list:
+        """
+        Группирует записи по шагам и считает перцентили времени выполнения.
+
+        Возвращает:
+            list: Строки сводки с полями SUMMARY_FIELDS, самые долгие шаги первыми.
+        """
+        groups = defaultdict(list)
+        with self._lock:
+            for record in self.records:
+                groups[record["step"]].append(record)
+        rows = []
+        for step, records in groups.items():
+            durations = sorted(r["duration_ms"] for r in records)
+            rows.append({
+                "step": step,
+                "count": len(records),
+                "total_ms": round(sum(durations), 3),
+                "mean_ms": round(sum(durations) / len(durations), 3),
+                "p50_ms": round(percentile(durations, 50), 3),
+                "p95_ms": round(percentile(durations, 95), 3),
+                "p99_ms": round(percentile(durations, 99), 3),
+                "webdriver_commands": sum(r["webdriver_commands"] for r in records),
+                "http_requests": sum(r["http_requests"] for r in records),
+                "http_bytes": sum(r["http_bytes"] for r in records),
+                "http_ms": round(sum(r["http_ms"] for r in records), 3),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def flame(self, test: str = None) -> str:
+        """
+        Возвращает собственное время шагов в формате свёрнутых стеков
+        ("тест;шаг;вложенный шаг <микросекунды>").
+
+        Аргументы:
+            test (str): Ограничить вывод одним тестом.
+        """
+        totals = defaultdict(float)
+        with self._lock:
+            for record in self.records:
+                if test is None or record["test"] == test:
+                    totals[record["path"]] += record["self_ms"]
+        return "\n".join(f"{path} {round(ms * 1000)}" for path, ms in sorted(totals.items()))
+
+    def merge_worker_records(self, directory: str):
+        """
+        Добавляет сырые замеры воркеров xdist из подкаталогов directory.
+        """
+        if not os.path.isdir(directory):
+            return
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name, "records.json")
+            if not os.path.isfile(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                records = json.load(f)
+            with self._lock:
+                self.records.extend(records)
+
+    def write_report(self, directory: str):
+        """
+        Записывает records.json, steps.json, steps.csv и flame.txt в каталог.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            records = list(self.records)
+        with open(os.path.join(directory, "records.json"), "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        rows = self.summary()
+        with open(os.path.join(directory, "steps.json"), "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(directory, "steps.csv"), "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(os.path.join(directory, "flame.txt"), "w", encoding="utf-8") as f:
+            f.write(self.flame())
+
+
+def _instrument_http(recorder: StepRecorder):
+    """
+    Подключает счётчик HTTP-запросов.
+
+    Возвращает:
+        Callable: Функция, отменяющая подключение.
+    """
+    from requests.adapters import HTTPAdapter
+
+    original_send = HTTPAdapter.send
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = original_send(self, request, **kwargs)
+        size = len(response.content) if not kwargs.get("stream") else int(
+            response.headers.get("Content-Length", 0))
+        recorder.count_http(size, (time.perf_counter() - started) * 1000)
+        return response
+
+    HTTPAdapter.send = send
+
+    def restore():
+        HTTPAdapter.send = original_send
+
+    return restore
+
+
+def _instrument_webdriver(recorder: StepRecorder):
+    """
+    Подключает счётчик команд WebDriver, если Selenium уже импортирован
+    собранными тестами; API-тесты не должны загружать Selenium ради замеров.
+
+    Возвращает:
+        Callable | None: Функция, отменяющая подключение.
+    """
+    module = sys.modules.get("selenium.webdriver.remote.remote_connection")
+    if module is None:
+        return None
+    original_execute = module.RemoteConnection.execute
+
+    def execute(self, command, params):
+        recorder.count_webdriver_command()
+        return original_execute(self, command, params)
+
+    module.RemoteConnection.execute = execute
+
+    def restore():
+        module.RemoteConnection.execute = original_execute
+
+    return restore
+
+
+def pytest_addoption(parser):
+    parser.getgroup('kinopoisk').addoption(
+        '--perf-report', metavar='DIR', default=None,
+        help='Замерять время шагов Allure и записать сводку в каталог DIR.'
+    )
+
+
+def enable(config) -> StepRecorder:
+    """
+    Включает замеры шагов для сессии; повторный вызов возвращает тот же объект.
+    Используется также плагином plugins.baseline.
+
+    Аргументы:
+        config (pytest.Config): Конфигурация pytest.
+
+    Возвращает:
+        StepRecorder: Объект, собирающий замеры.
+    """
+    recorder = getattr(config, '_perf_recorder', None)
+    if recorder is None:
+        if not step_templates_supported():
+            config.issue_config_time_warning(pytest.PytestWarning(
+                "plugins.timing: шаблоны названий шагов не распознаются в этой версии "
+                "allure-python, шаги группируются по полному названию"), stacklevel=2)
+        recorder = StepRecorder()
+        allure_commons.plugin_manager.register(recorder)
+        config._perf_recorder = recorder
+        config._perf_restore = [_instrument_http(recorder)]
+    return recorder
+
+
+@contextlib.contextmanager
+def suspended(config):
+    """
+    Исключает шаги, выполненные внутри блока, из замеров и сравнения с эталоном,
+    например шаги нагрузочного прогона, которые исказили бы статистику обычных шагов.
+    Без включённых замеров ничего не делает.
+
+    Аргументы:
+        config (pytest.Config): Конфигурация pytest.
+    """
+    recorder = getattr(config, '_perf_recorder', None)
+    if recorder is None:
+        yield
+        return
+    with recorder.suspended():
+        yield
+
+
+def pytest_configure(config):
+    directory = config.getoption('--perf-report')
+    if not directory:
+        return
+    if not hasattr(config, 'workerinput') and os.path.isdir(directory):
+        # Замеры воркеров прошлого запуска не должны попасть в новую сводку.
+        for name in os.listdir(directory):
+            stale = os.path.join(directory, name, "records.json")
+            if os.path.isfile(stale):
+                os.remove(stale)
+    enable(config)
+
+
+def pytest_collection_finish(session):
+    recorder = getattr(session.config, '_perf_recorder', None)
+    if recorder is None:
+        return
+    restore = _instrument_webdriver(recorder)
+    if restore is not None:
+        session.config._perf_restore.append(restore)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    recorder = getattr(config, '_perf_recorder', None)
+    if recorder is None:
+        return
+    for restore in config._perf_restore:
+        restore()
+    allure_commons.plugin_manager.unregister(recorder)
+    directory = config.getoption('--perf-report')
+    if not directory:
+        return
+    if hasattr(config, 'workerinput'):
+        recorder.write_report(os.path.join(directory, config.workerinput['workerid']))
+        return
+    recorder.merge_worker_records(directory)
+    recorder.write_report(directory)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Шаги фикстур выполняются при подготовке и завершении теста и относятся к нему.
+    recorder = getattr(item.config, '_perf_recorder', None)
+    if recorder is not None:
+        recorder.current_test = item.nodeid
+    yield
+    if recorder is not None:
+        recorder.current_test = "<session>"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    recorder = getattr(item.config, '_perf_recorder', None)
+    if recorder is None:
+        return
+    flame = recorder.flame(item.nodeid)
+    if flame:
+        allure.attach(flame, name="Профиль шагов (мкс)",
+                      attachment_type=allure.attachment_type.TEXT)
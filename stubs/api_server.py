@@ -0,0 +1,146 @@
+"""
+Модуль локального сервера-заглушки API Кинопоиска.
+
+Сервер воспроизводит обмены из кассеты и позволяет добавить к ответам
+задержку и случайные ошибки, чтобы проверять клиент без сети.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from stubs.cassette import Cassette
+
+
+class FaultProfile:
+    """
+    Профиль искусственных задержек и ошибок сервера-заглушки.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: int = None):
+        """
+        Аргументы:
+            latency_ms (float): Базовая задержка ответа в миллисекундах.
+            jitter_ms (float): Случайная добавка к задержке, от 0 до jitter_ms.
+            error_rate (float): Доля запросов, на которые отвечается ошибкой, от 0 до 1.
+            error_status (int): HTTP-статус искусственной ошибки.
+            seed (int): Зерно генератора для воспроизводимости.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """
+        Возвращает задержку очередного ответа в секундах.
+        """
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def should_fail(self) -> bool:
+        """
+        Решает, ответить ли на очередной запрос ошибкой.
+        """
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.requests += 1
+        delay = stub.profile.delay()
+        if delay:
+            time.sleep(delay)
+        if stub.profile.should_fail():
+            self._send(stub.profile.error_status, {}, json.dumps({"message": "Injected error"}))
+            return
+        url = urlsplit(self.path)
+        record = stub.cassette.find(url.path, url.query, "X-API-KEY" in self.headers)
+        if record is None:
+            stub.misses += 1
+            self._send(404, {}, json.dumps({"message": f"Interaction not recorded: {self.path}"}))
+            return
+        self._send(record["status"], record["headers"], record["body"])
+
+    def _send(self, status: int, headers: dict, body: str):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if "Content-Type" not in headers:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubApiServer:
+    """
+    Локальный HTTP-сервер, воспроизводящий API Кинопоиска по кассете.
+
+    Запускается в фоновом потоке; базовый URL для клиента доступен в атрибуте url.
+    """
+
+    def __init__(self, cassette: Cassette, profile: FaultProfile = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Аргументы:
+            cassette (Cassette): Кассета с записанными обменами.
+            profile (FaultProfile): Профиль задержек и ошибок; по умолчанию без них.
+            host (str): Адрес для прослушивания.
+            port (int): Порт; 0 — выбрать свободный.
+        """
+        self.cassette = cassette
+        self.profile = profile or FaultProfile()
+        self.requests = 0
+        self.misses = 0
+        self._httpd = ThreadingHTTPServer((host, port), _StubRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Базовый URL сервера.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubApiServer":
+        """
+        Запускает сервер в фоновом потоке.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Останавливает сервер и освобождает порт.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,153 @@
+"""
+Модуль для записи и хранения обменов с API Кинопоиска (кассет).
+
+Кассета — JSON-файл со списком запросов и ответов, по которому
+локальный сервер-заглушка воспроизводит API без обращения к сети.
+"""
+
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Заголовки ответа, которые имеет смысл воспроизводить.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Cache-Control", "Retry-After")
+
+
+def make_key(path: str, query: str, authorized: bool) -> str:
+    """
+    Строит ключ обмена, не зависящий от порядка параметров запроса.
+
+    Аргументы:
+        path (str): Путь относительно базового URL API, например /movie/search.
+        query (str): Строка параметров запроса без '?'.
+        authorized (bool): Был ли в запросе заголовок X-API-KEY.
+
+    Возвращает:
+        str: Ключ обмена.
+    """
+    canonical = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return f"{'auth' if authorized else 'anon'} {path}?{canonical}"
+
+
+class Cassette:
+    """
+    Набор записанных обменов с API, сохраняемый в JSON-файл.
+    """
+
+    def __init__(self, path: str, interactions: dict = None):
+        """
+        Инициализация кассеты.
+
+        Аргументы:
+            path (str): Путь к файлу кассеты.
+            interactions (dict): Обмены по ключам make_key().
+        """
+        self.path = path
+        self.interactions = interactions or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, missing_ok: bool = False) -> "Cassette":
+        """
+        Загружает кассету из файла.
+
+        Аргументы:
+            path (str): Путь к файлу кассеты.
+            missing_ok (bool): Вернуть пустую кассету, если файла нет.
+
+        Возвращает:
+            Cassette: Загруженная кассета.
+
+        Исключения:
+            FileNotFoundError: Если файла нет и missing_ok не задан.
+        """
+        if missing_ok and not os.path.exists(path):
+            return cls(path)
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        return cls(path, {record["key"]: record for record in records})
+
+    def save(self):
+        """
+        Сохраняет кассету в файл, создавая каталог при необходимости.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            records = sorted(self.interactions.values(), key=lambda record: record["key"])
+        with open(self.path, "w", encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+
+    def find(self, path: str, query: str, authorized: bool):
+        """
+        Ищет записанный обмен.
+
+        Возвращает:
+            dict: Запись с полями status, headers, body или None.
+        """
+        return self.interactions.get(make_key(path, query, authorized))
+
+    def add(self, path: str, query: str, authorized: bool,
+            status: int, headers: dict, body: str):
+        """
+        Добавляет или перезаписывает обмен.
+
+        Аргументы:
+            path (str): Путь относительно базового URL API.
+            query (str): Строка параметров запроса.
+            authorized (bool): Был ли в запросе заголовок X-API-KEY.
+            status (int): HTTP-статус ответа.
+            headers (dict): Воспроизводимые заголовки ответа.
+            body (str): Тело ответа.
+        """
+        key = make_key(path, query, authorized)
+        with self._lock:
+            self.interactions[key] = {
+                "key": key,
+                "status": status,
+                "headers": headers,
+                "body": body,
+            }
+
+
+class CassetteRecorder:
+    """
+    Хук ответа requests, записывающий обмены с API в кассету.
+    """
+
+    def __init__(self, cassette: Cassette, base_url: str):
+        """
+        Аргументы:
+            cassette (Cassette): Кассета для записи.
+            base_url (str): Базовый URL API; его путь отрезается от путей запросов.
+        """
+        self.cassette = cassette
+        self.base_path = urlsplit(base_url).path.rstrip("/")
+
+    def attach(self, session):
+        """
+        Подключает запись ко всем ответам сессии.
+
+        Аргументы:
+            session (requests.Session): Сессия клиента API.
+        """
+        session.hooks["response"].append(self)
+
+    def __call__(self, response, *args, **kwargs):
+        if response.status_code == 304:
+            return response
+        url = urlsplit(response.request.url)
+        path = url.path
+        if path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        self.cassette.add(
+            path,
+            url.query,
+            "X-API-KEY" in response.request.headers,
+            response.status_code,
+            {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            response.text,
+        )
+        return response
@@ -0,0 +1,318 @@
+"""
+Модуль локального веб-приложения, повторяющего страницы Кинопоиска для UI-тестов.
+
+Приложение отдаёт страницы поиска, входа и карточки фильма с теми же селекторами,
+что используют PageObject-классы, поэтому UI-тесты и замеры производительности
+можно выполнять без обращения к настоящему сайту.
+Фильмы берутся из кассет API (stubs.cassette) и тестовых данных.
+"""
+
+import html
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from stubs.api_server import FaultProfile
+from stubs.cassette import Cassette
+
+SEARCH_DATA_KEYS = ("search_exact", "search_partial", "search_en")
+
+_PAGE = """<!DOCTYPE html>
+<html lang="ru">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<header>{account}</header>
+{search_form}<main>{content}</main>
+</body>
+</html>
+"""
+
+_SEARCH_FORM = """<form class="search-form" action="/search" method="get">
+<input type="text" name="search" value="{query}">
+<button type="submit">Найти</button>
+</form>
+"""
+
+
+class FilmCatalog:
+    """
+    Набор фильмов, которые показывает локальное приложение.
+    """
+
+    def __init__(self):
+        self.films = {}
+
+    def add(self, film_id: int, name: str, alternative_name: str = "",
+            description: str = "", actors=(), poster_url: str = ""):
+        """
+        Добавляет фильм в каталог; повторное добавление дополняет пустые поля.
+        """
+        film = self.films.setdefault(film_id, {
+            "id": film_id, "name": "", "alternative_name": "",
+            "description": "", "actors": [], "poster_url": "",
+        })
+        for key, value in (("name", name), ("alternative_name", alternative_name),
+                           ("description", description), ("actors", list(actors)),
+                           ("poster_url", poster_url)):
+            if value and not film[key]:
+                film[key] = value
+
+    def add_api_doc(self, doc: dict):
+        """
+        Добавляет фильм из документа ответа API (/movie/search или /movie/{id}).
+        """
+        if not doc.get("id") or not doc.get("name"):
+            return
+        self.add(
+            doc["id"],
+            doc["name"],
+            doc.get("alternativeName") or doc.get("enName") or "",
+            doc.get("description") or doc.get("shortDescription") or "",
+            [person.get("name") for person in doc.get("persons") or []
+             if person.get("name") and person.get("enProfession") == "actor"],
+            (doc.get("poster") or {}).get("url") or "",
+        )
+
+    @classmethod
+    def from_sources(cls, cassette: Cassette = None, test_data: dict = None) -> "FilmCatalog":
+        """
+        Собирает каталог из успешных ответов кассеты и поисковых запросов тестовых данных.
+
+        Для запросов из тестовых данных, которых нет в кассете, добавляется фильм
+        с названием, совпадающим с запросом, чтобы позитивные сценарии поиска работали.
+        """
+        catalog = cls()
+        if cassette is not None:
+            for record in cassette.interactions.values():
+                if record["status"] != 200:
+                    continue
+                try:
+                    body = json.loads(record["body"])
+                except ValueError:
+                    continue
+                for doc in body.get("docs", [body]):
+                    catalog.add_api_doc(doc)
+        for key in SEARCH_DATA_KEYS:
+            query = (test_data or {}).get(key)
+            if query and not catalog.search(query):
+                catalog.add(len(catalog.films) + 1_000_000, query, description=query)
+        return catalog
+
+    def search(self, query: str) -> list:
+        """
+        Ищет фильмы по вхождению запроса в русское или альтернативное название.
+        """
+        needle = query.strip().casefold()
+        if not needle:
+            return []
+        return [film for film in self.films.values()
+                if needle in film["name"].casefold()
+                or needle in film["alternative_name"].casefold()]
+
+
+class _WebAppHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        app = self.server.app
+        app.delay()
+        url = urlsplit(self.path)
+        path = "/" + url.path.strip("/")
+        params = parse_qs(url.query)
+        if path == "/":
+            self._page("Кинопоиск", "")
+        elif path == "/search":
+            self._search(params.get("search", [""])[0])
+        elif path == "/login":
+            self._login_form("")
+        elif path == "/logout":
+            app.sessions.discard(self._session())
+            self._redirect("/", "session=; Max-Age=0; Path=/")
+        elif path.startswith("/film/"):
+            self._film(path[len("/film/"):])
+        else:
+            self._page("Страница не найдена", '<p class="error-message">Страница не найдена</p>',
+                       status=404)
+
+    def do_POST(self):
+        app = self.server.app
+        app.delay()
+        if "/" + urlsplit(self.path).path.strip("/") != "/login":
+            self._page("Страница не найдена", "", status=404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+        login = form.get("login", [""])[0]
+        password = form.get("password", [""])[0]
+        if not login and not password:
+            self._login_form("Введите данные для входа")
+        elif not password:
+            self._login_form("Введите пароль")
+        elif not login:
+            self._login_form("Введите email или телефон")
+        elif app.credentials.get(login) != password:
+            self._login_form("Неверные данные")
+        else:
+            session = secrets.token_hex(16)
+            app.sessions.add(session)
+            self._redirect("/", f"session={session}; Path=/")
+
+    def _session(self) -> str:
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "session":
+                return value
+        return ""
+
+    def _search(self, query: str):
+        films = self.server.app.catalog.search(query)
+        if films:
+            items = "".join(
+                f'<li><a class="movie-title" href="/film/{film["id"]}/">'
+                f'{html.escape(film["name"])}</a></li>'
+                for film in films
+            )
+            content = f'<ul class="search-results">{items}</ul>'
+        else:
+            content = '<p class="search-empty">По вашему запросу ничего не найдено</p>'
+        self._page("Результаты поиска", content, query=query)
+
+    def _film(self, film_id: str):
+        film = self.server.app.catalog.films.get(int(film_id)) if film_id.isdigit() else None
+        if film is None:
+            self._page("Фильм не найден", '<p class="error-message">Фильм не найден</p>',
+                       status=404)
+            return
+        actors = "".join(f'<li><a class="actor" href="#">{html.escape(name)}</a></li>'
+                         for name in film["actors"])
+        poster = (f'<div class="film-poster"><img src="{html.escape(film["poster_url"])}" '
+                  f'alt="Постер"></div>') if film["poster_url"] else ""
+        content = (
+            f'<div class="film-card">'
+            f'<h1 class="film-title">{html.escape(film["name"])}</h1>'
+            f'{poster}'
+            f'<p class="film-description">{html.escape(film["description"])}</p>'
+            f'<ul class="film-actors">{actors}</ul>'
+            f'<button type="button" disabled>Смотреть</button>'
+            f'</div>'
+        )
+        self._page(film["name"], content)
+
+    def _login_form(self, error: str):
+        message = f'<p class="error-message">{html.escape(error)}</p>' if error else ""
+        content = (
+            '<form class="login-form" action="/login" method="post">'
+            '<input type="text" name="login">'
+            '<input type="password" name="password">'
+            f'{message}'
+            '<button type="submit">Войти</button>'
+            '</form>'
+        )
+        # Как и на сайте, на странице входа нет формы поиска: иначе её кнопка
+        # первой подходит под локатор кнопки входа.
+        self._page("Вход", content, search_form=False)
+
+    def _page(self, title: str, content: str, query: str = "", status: int = 200,
+              search_form: bool = True):
+        if self._session() in self.server.app.sessions:
+            account = '<a class="logout" href="/logout">Выйти</a>'
+        else:
+            account = '<a class="login" href="/login">Войти</a>'
+        form = _SEARCH_FORM.format(query=html.escape(query)) if search_form else ""
+        body = _PAGE.format(title=html.escape(title), account=account,
+                            search_form=form, content=content)
+        self._send(status, body, {"Content-Type": "text/html; charset=utf-8"})
+
+    def _redirect(self, location: str, cookie: str):
+        self._send(303, "", {"Location": location, "Set-Cookie": cookie})
+
+    def _send(self, status: int, body: str, headers: dict):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWebApp:
+    """
+    Локальный HTTP-сервер с упрощёнными страницами Кинопоиска.
+
+    Запускается в фоновом потоке; базовый URL для PageObject-классов доступен в атрибуте url.
+    """
+
+    def __init__(self, catalog: FilmCatalog, credentials: dict = None,
+                 profile: FaultProfile = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Аргументы:
+            catalog (FilmCatalog): Фильмы для поиска и карточек.
+            credentials (dict): Допустимые пары логин → пароль.
+            profile (FaultProfile): Профиль задержек ответов; ошибки профиля не используются.
+            host (str): Адрес для прослушивания.
+            port (int): Порт; 0 — выбрать свободный.
+        """
+        self.catalog = catalog
+        self.credentials = credentials or {}
+        self.profile = profile or FaultProfile()
+        self.sessions = set()
+        self._httpd = ThreadingHTTPServer((host, port), _WebAppHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._thread = None
+
+    @classmethod
+    def from_test_data(cls, test_data: dict, cassette: Cassette = None,
+                       profile: FaultProfile = None) -> "StubWebApp":
+        """
+        Создаёт приложение с каталогом и учётными данными из тестовых данных.
+        """
+        password = test_data.get("valid_password", "")
+        credentials = {test_data[key]: password
+                       for key in ("valid_email", "valid_phone") if test_data.get(key)}
+        return cls(FilmCatalog.from_sources(cassette, test_data), credentials, profile)
+
+    @property
+    def url(self) -> str:
+        """
+        Базовый URL приложения.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self):
+        """
+        Выдерживает задержку ответа согласно профилю.
+        """
+        seconds = self.profile.delay()
+        if seconds:
+            time.sleep(seconds)
+
+    def start(self) -> "StubWebApp":
+        """
+        Запускает приложение в фоновом потоке.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Останавливает приложение и освобождает порт.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
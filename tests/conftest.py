@@ -1,22 +1,103 @@
 """
 Модуль содержит фикстуры для pytest:
 - Загрузка тестовых данных и конфигурации;
-- Настройка и завершение сессии браузера Chrome для автотестов.
+- Общие синхронный и асинхронный клиенты API Кинопоиска с пулом соединений на всю сессию;
+- Режимы работы с API: живой сервер, запись кассеты и воспроизведение
+  через локальный сервер-заглушку (опция --api-mode);
+- Локальное веб-приложение вместо сайта Кинопоиска (опция --ui-mode=local).
+- Нагрузочные тесты (маркер load) выбираются только с опцией --run-load.
+
+Фикстуры браузера (browser, logged_in_browser и связанные с ними) находятся в плагине
+plugins.browser_fixtures: Selenium загружается, только когда их запрашивает тест.
+
+Параллельный запуск (pytest -n auto) обеспечивает плагин plugins.parallel,
+замеры времени шагов (опция --perf-report) — плагин plugins.timing,
+сравнение с эталоном времени (опция --perf-baseline) — плагин plugins.baseline,
+профиль импортов при сборе тестов (опция --import-profile) — плагин plugins.import_profile,
+фоновую запись результатов Allure и диагностику упавших тестов — плагин plugins.allure_writer.
 """
 
 import configparser
 import json
+import os
 
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+from api.async_kinopoisk_api import AsyncKinopoiskApi
+from api.cache import ResponseCache
+from api.kinopoisk_api import KinopoiskApi
+from api.rate_limit import RateLimiter
+from stubs.api_server import FaultProfile, StubApiServer
+from stubs.cassette import Cassette, CassetteRecorder
+from stubs.web_app import StubWebApp
+
+pytest_plugins = [
+    'plugins.parallel',
+    'plugins.timing',
+    'plugins.baseline',
+    'plugins.import_profile',
+    'plugins.browser_fixtures',
+    'plugins.allure_writer',
+]
+
+def pytest_addoption(parser):
+    """
+    Регистрирует опции командной строки для выбора режима работы с API.
+    """
+    group = parser.getgroup('kinopoisk')
+    group.addoption(
+        '--api-mode', choices=('live', 'record', 'replay'), default='live',
+        help='live — запросы к настоящему API; record — запись обменов в кассету; '
+             'replay — воспроизведение кассеты локальным сервером-заглушкой.'
+    )
+    group.addoption(
+        '--cassette', default='config/cassettes/kinopoisk_api.json',
+        help='Путь к файлу кассеты для режимов record и replay.'
+    )
+    group.addoption(
+        '--ui-mode', choices=('live', 'local'), default='live',
+        help='live — UI-тесты на сайте из config.ini; local — на локальном веб-приложении '
+             'с данными из тестовых данных и кассеты.'
+    )
+    group.addoption(
+        '--browser-mode', choices=('pooled', 'isolated', 'contexts'), default='pooled',
+        help='pooled — браузеры переиспользуются между тестами; '
+             'isolated — отдельный браузер на каждый тест; '
+             'contexts — изолированный контекст (как окно инкогнито) в общем Chrome на каждый тест.'
+    )
+    group.addoption(
+        '--run-load', action='store_true', default=False,
+        help='Запускать нагрузочные тесты (маркер load); по умолчанию они не выбираются.'
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'load: нагрузочный тест, запускается только с опцией --run-load'
+    )
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Отменяет выбор нагрузочных тестов без опции --run-load.
+    """
+    if config.getoption('--run-load'):
+        return
+    selected, deselected = [], []
+    for item in items:
+        (deselected if item.get_closest_marker('load') else selected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
 
 @pytest.fixture(scope='session')
-def test_data():
+def test_data(request):
     """
     Загружает тестовые данные из файла .json (один раз за сессию).
+    Воркеры xdist получают данные, прочитанные контроллером.
     """
+    from plugins.parallel import shared_test_data
+    data = shared_test_data(request.config)
+    if data is not None:
+        return data
     with open('config/test_data.json', encoding='utf-8') as f:
         return json.load(f)
 
@@ -29,13 +110,137 @@ def config():
     parser.read('config/config.ini')
     return parser
 
-@pytest.fixture
-def browser():
+@pytest.fixture(scope='session')
+def api_shared(config):
+    """
+    Создаёт кэш ответов и ограничитель частоты запросов, общие для синхронного
+    и асинхронного клиентов API (один раз за сессию); файл кэша закрывается в конце сессии.
+
+    Кэш создаётся, только если включён параметром cache секции [api];
+    пустой cache_path оставляет кэш только в памяти.
+    Ненулевой rate_limit ограничивает число запросов в секунду суммарно для всех воркеров,
+    rate_limit_burst — сколько запросов можно отправить подряд без пауз.
+    """
+    section = config['api']
+    rate_limit = section.getfloat('rate_limit', 0)
+    cache = None
+    if section.getboolean('cache', False):
+        cache = ResponseCache(
+            maxsize=section.getint('cache_size', 256),
+            ttl=section.getfloat('cache_ttl', 300),
+            path=section.get('cache_path') or None,
+        )
+    yield {
+        'cache': cache,
+        'rate_limiter': RateLimiter(
+            rate_limit,
+            state_file=section.get('rate_limit_state', '.cache/api_rate.json'),
+            burst=section.getint('rate_limit_burst', 1),
+        ) if rate_limit > 0 else None,
+    }
+    if cache is not None:
+        cache.close()
+
+def _api_options(config, shared: dict) -> dict:
+    """
+    Собирает параметры клиента API из секции [api] файла config.ini
+    и общих для клиентов кэша и ограничителя частоты (фикстура api_shared).
+
+    Ответы 429 и 5xx повторяются до max_retries раз с паузой из Retry-After
+    или экспоненциальной паузой со случайным разбросом.
+    """
+    section = config['api']
+    return {
+        **shared,
+        'timeout': section.getfloat('timeout', 10),
+        'pool_connections': section.getint('pool_connections', 4),
+        'pool_maxsize': section.getint('pool_maxsize', 10),
+        'pool_block': section.getboolean('pool_block', False),
+        'max_retries': section.getint('max_retries', 0),
+        'backoff_factor': section.getfloat('backoff_factor', 0.3),
+        'max_backoff': section.getfloat('max_backoff', 30),
+        'keep_alive': section.getboolean('keep_alive', True),
+    }
+
+@pytest.fixture(scope='session')
+def api_cassette(request):
     """
-    Запускает браузер Chrome в headless-режиме для каждого теста и корректно завершает сессию.
+    Кассета для записи обменов с API в режиме record; сохраняется в конце сессии.
+    В остальных режимах возвращает None.
+    """
+    if request.config.getoption('--api-mode') != 'record':
+        yield None
+        return
+    cassette = Cassette.load(request.config.getoption('--cassette'), missing_ok=True)
+    yield cassette
+    cassette.save()
+
+def _fault_profile(config) -> FaultProfile:
+    """
+    Собирает профиль задержек и ошибок локальных заглушек из секции [stub].
+    """
+    section = config['stub'] if config.has_section('stub') else config[config.default_section]
+    return FaultProfile(
+        latency_ms=section.getfloat('latency_ms', 0),
+        jitter_ms=section.getfloat('jitter_ms', 0),
+        error_rate=section.getfloat('error_rate', 0),
+        error_status=section.getint('error_status', 503),
+    )
+
+@pytest.fixture(scope='session')
+def api_base_url(request, config):
+    """
+    Базовый URL API: настоящий сервер или локальная заглушка в режиме replay.
+    Задержки и ошибки заглушки настраиваются в секции [stub] файла config.ini.
+    """
+    if request.config.getoption('--api-mode') != 'replay':
+        yield config['api']['base_url']
+        return
+    cassette = Cassette.load(request.config.getoption('--cassette'))
+    with StubApiServer(cassette, _fault_profile(config)) as server:
+        yield server.url
+
+@pytest.fixture(scope='session')
+def kinopoisk_api(api_base_url, api_cassette, api_shared, config, test_data):
+    """
+    Создаёт клиент API Кинопоиска с пулом keep-alive соединений (один раз за сессию).
+    """
+    with KinopoiskApi(api_base_url, test_data['api_key'], **_api_options(config, api_shared)) as api:
+        if api_cassette is not None:
+            CassetteRecorder(api_cassette, api_base_url).attach(api.session)
+        yield api
+
+@pytest.fixture(scope='session')
+def async_kinopoisk_api(api_base_url, api_cassette, api_shared, config, test_data):
+    """
+    Создаёт асинхронный клиент API Кинопоиска для пакетных запросов (один раз за сессию).
+    """
+    options = _api_options(config, api_shared)
+    concurrency = config['api'].getint('concurrency', 10)
+    options['pool_maxsize'] = max(options['pool_maxsize'], concurrency)
+    client = AsyncKinopoiskApi(
+        api_base_url, test_data['api_key'], concurrency=concurrency, **options
+    )
+    if api_cassette is not None:
+        CassetteRecorder(api_cassette, api_base_url).attach(client.api.session)
+    yield client
+    client.close()
+
+@pytest.fixture(scope='session')
+def ui_base_url(request, config, test_data):
+    """
+    Базовый URL сайта для UI-тестов.
+
+    В режиме --ui-mode=local запускает локальное веб-приложение и подменяет
+    config['ui']['base_url'], чтобы тесты и PageObject-классы работали с ним.
     """
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    yield driver
-    driver.quit()
+    if request.config.getoption('--ui-mode') != 'local':
+        yield config['ui']['base_url']
+        return
+    cassette_path = request.config.getoption('--cassette')
+    cassette = Cassette.load(cassette_path) if os.path.exists(cassette_path) else None
+    live_url = config['ui']['base_url']
+    with StubWebApp.from_test_data(test_data, cassette, _fault_profile(config)) as app:
+        config['ui']['base_url'] = app.url
+        yield app.url
+        config['ui']['base_url'] = live_url
@@ -5,9 +5,15 @@
 а также работу с пустыми, длинными запросами и ошибкой авторизации.
 """
 
+import asyncio
+
 import pytest
 import allure
-import requests
+
+from api.kinopoisk_api import KinopoiskApi
+from api.load import QueryMix, build_stub_cassette, run_load
+from plugins import timing
+from stubs.api_server import StubApiServer
 
 @allure.feature("Поиск фильмов по API")
 class TestMovieSearchAPI:
@@ -23,22 +29,19 @@ class TestMovieSearchAPI:
         ]
     )
     @allure.story("Позитивные проверки поиска фильмов")
-    def test_search_movie_positive(self, test_data, config, search_query, expected_in_result):
+    def test_search_movie_positive(self, test_data, kinopoisk_api, search_query, expected_in_result):
         """
         Проверяет успешный поиск фильма: результат не пустой.
         """
-        base_url = config['api']['base_url']
-        api_key = test_data['api_key']
+        base_url = kinopoisk_api.base_url
         query = test_data[search_query]
 
         with allure.step(f"Выполнить GET /movie/search?query={query}"):
-            headers = {"X-API-KEY": api_key}
             params = {"query": query}
-            response = requests.get(
+            response = kinopoisk_api.session.get(
                 f"{base_url}/movie/search",
                 params=params,
-                headers=headers,
-                timeout=10
+                timeout=kinopoisk_api.timeout
             )
             assert response.status_code == 200
             results = response.json().get("docs", [])
@@ -52,88 +55,158 @@ class TestMovieSearchAPI:
         ]
     )
     @allure.story("Негативные проверки поиска фильмов")
-    def test_search_movie_negative(self, test_data, config, search_query):
+    def test_search_movie_negative(self, test_data, kinopoisk_api, search_query):
         """
         Проверяет, что поиск по некорректному 
         или несуществующему фильму возвращает пустой результат.
         """
-        base_url = config['api']['base_url']
-        api_key = test_data['api_key']
+        base_url = kinopoisk_api.base_url
         query = test_data[search_query]
 
         with allure.step(f"Выполнить GET /movie/search?query={query}"):
-            headers = {"X-API-KEY": api_key}
             params = {"query": query}
-            response = requests.get(
+            response = kinopoisk_api.session.get(
                 f"{base_url}/movie/search",
                 params=params,
-                headers=headers,
-                timeout=10
+                timeout=kinopoisk_api.timeout
             )
             assert response.status_code == 200
             results = response.json().get("docs", [])
             assert len(results) == 0, "Ожидался пустой список фильмов"
 
     @allure.story("Поиск с пустым запросом")
-    def test_search_movie_empty_query(self, test_data, config):
+    def test_search_movie_empty_query(self, kinopoisk_api):
         """
         Проверяет, что при пустом поисковом запросе фильм не находится.
         """
-        base_url = config['api']['base_url']
-        api_key = test_data['api_key']
+        base_url = kinopoisk_api.base_url
         query = ""
 
         with allure.step("Выполнить GET /movie/search?query='' (пустой запрос)"):
-            headers = {"X-API-KEY": api_key}
             params = {"query": query}
-            response = requests.get(
+            response = kinopoisk_api.session.get(
                 f"{base_url}/movie/search",
                 params=params,
-                headers=headers,
-                timeout=10
+                timeout=kinopoisk_api.timeout
             )
             assert response.status_code == 200
             results = response.json().get("docs", [])
             assert len(results) == 0, "Для пустого запроса должен быть пустой результат"
 
     @allure.story("Поиск по очень длинной строке (100+ символов)")
-    def test_search_movie_long_query(self, test_data, config):
+    def test_search_movie_long_query(self, kinopoisk_api):
         """
         Проверяет обработку длинного поискового запроса (100+ символов) — 
         результат должен быть пустым.
         """
-        base_url = config['api']['base_url']
-        api_key = test_data['api_key']
+        base_url = kinopoisk_api.base_url
         query = "a" * 120
 
         with allure.step("Выполнить GET /movie/search?query=('a'*120)"):
-            headers = {"X-API-KEY": api_key}
             params = {"query": query}
-            response = requests.get(
+            response = kinopoisk_api.session.get(
                 f"{base_url}/movie/search",
                 params=params,
-                headers=headers,
-                timeout=10
+                timeout=kinopoisk_api.timeout
             )
             assert response.status_code == 200
             results = response.json().get("docs", [])
             assert len(results) == 0, "Ожидался пустой список для слишком длинного запроса"
 
     @allure.story("Запрос без API-ключа")
-    def test_search_movie_without_apikey(self, test_data, config):
+    def test_search_movie_without_apikey(self, test_data, kinopoisk_api):
         """
         Проверяет, что при отсутствии API-ключа сервер возвращает ошибку авторизации.
         """
-        base_url = config['api']['base_url']
+        base_url = kinopoisk_api.base_url
         query = test_data["search_exact"]
 
         with allure.step("Выполнить GET /movie/search без API-KEY"):
             params = {"query": query}
-            response = requests.get(
+            response = kinopoisk_api.session.get(
                 f"{base_url}/movie/search",
                 params=params,
-                timeout=10
+                headers={"X-API-KEY": None},
+                timeout=kinopoisk_api.timeout
             )
             assert response.status_code in (401, 403), (
                 "Должен быть статус 401 или 403 (ошибка авторизации)"
             )
+
+    @allure.story("Пакетный поиск фильмов")
+    def test_search_many_keeps_order(self, test_data, async_kinopoisk_api):
+        """
+        Проверяет, что пакетный поиск возвращает результаты в порядке запросов.
+        """
+        keys = ["search_exact", "search_partial", "search_en", "search_fake"]
+        queries = [test_data[key] for key in keys]
+
+        results = asyncio.run(async_kinopoisk_api.search_many(queries))
+
+        assert len(results) == len(queries)
+        for key, result in zip(keys, results):
+            docs = result.get("docs", [])
+            if key == "search_fake":
+                assert len(docs) == 0, "Для несуществующего фильма ожидался пустой результат"
+            else:
+                assert len(docs) > 0, f"Ожидался хотя бы один фильм для '{key}'"
+
+    @allure.story("Позитивные проверки поиска фильмов")
+    def test_search_movie_select_fields(self, test_data, kinopoisk_api):
+        """
+        Проверяет, что при запросе отдельных полей в документах фильмов нет лишних полей.
+        """
+        result = kinopoisk_api.search_movie(test_data["search_exact"], fields=("id", "name"))
+
+        docs = result.get("docs", [])
+        assert len(docs) > 0, "Ожидался хотя бы один фильм в ответе"
+        for doc in docs:
+            assert set(doc) <= {"id", "name"}, f"Лишние поля в ответе: {sorted(doc)}"
+
+    @allure.story("Пакетный поиск фильмов")
+    def test_search_many_collapses_duplicates(self, test_data, async_kinopoisk_api):
+        """
+        Проверяет, что одинаковые одновременные запросы выполняются одним обращением к API
+        и получают один и тот же результат.
+        """
+        query = test_data["search_exact"]
+        collapsed_before = async_kinopoisk_api.flight.collapsed
+
+        results = asyncio.run(async_kinopoisk_api.search_many([query] * 5))
+
+        assert all(result is results[0] for result in results)
+        assert async_kinopoisk_api.flight.collapsed - collapsed_before == 4
+
+    @allure.story("Постраничный поиск фильмов")
+    def test_iter_search_pages(self, test_data, kinopoisk_api):
+        """
+        Проверяет постраничный перебор результатов поиска:
+        фильмы не повторяются и их не больше max_items.
+        """
+        movies = list(kinopoisk_api.iter_search(test_data["search_partial"],
+                                                page_size=5, max_items=12))
+
+        assert 0 < len(movies) <= 12
+        ids = [movie["id"] for movie in movies]
+        assert len(ids) == len(set(ids)), "Фильмы на разных страницах не должны повторяться"
+
+    @pytest.mark.load
+    @allure.story("Нагрузочный прогон клиента")
+    def test_load_against_stub(self, request, test_data):
+        """
+        Проверяет нагрузочный прогон клиента на локальном сервере-заглушке:
+        все запросы успешны, задержки попали в гистограмму.
+        Шаги прогона не попадают в замеры шагов и эталон времени.
+        """
+        mix = QueryMix.from_test_data(test_data, movie_ids=[1, 2, 3], seed=1)
+        with StubApiServer(build_stub_cassette(mix)) as server, \
+                KinopoiskApi(server.url, test_data["api_key"], pool_maxsize=4,
+                             coalesce=False) as api:
+            with timing.suspended(request.config):
+                result = run_load(api, mix, duration=1, concurrency=4)
+
+        allure.attach(result.format(), name="Итоги прогона",
+                      attachment_type=allure.attachment_type.TEXT)
+        assert result.requests > 0
+        assert result.errors == {}, f"Неожиданные ошибки: {result.errors}"
+        assert set(result.histograms) == {"search", "movie"}
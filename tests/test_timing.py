@@ -0,0 +1,48 @@
+"""
+Тесты плагина замеров шагов plugins.timing, не требующие сайта и API.
+"""
+
+import allure
+import allure_commons
+
+from plugins import timing
+
+
+@allure.step("Шаг {number} из 10")
+def _numbered_step(number):
+    pass
+
+
+@allure.feature("Замеры шагов")
+class TestStepTiming:
+    """
+    Проверки группировки шагов по шаблону названия.
+    """
+
+    @allure.story("Шаблон названия шага")
+    def test_step_template_recovered(self):
+        """
+        Проверяет, что шаблон названия берётся из @allure.step в установленной версии
+        allure-python: при изменении её внутреннего устройства тест упадёт.
+        """
+        assert timing.step_templates_supported()
+
+    @allure.story("Шаблон названия шага")
+    def test_steps_grouped_by_template(self):
+        """
+        Проверяет, что вызовы шага с разными аргументами попадают в одну группу,
+        даже если значение аргумента входит в остальной текст названия.
+        """
+        recorder = timing.StepRecorder()
+        allure_commons.plugin_manager.register(recorder)
+        try:
+            for number in (0, 1, 10):
+                _numbered_step(number)
+            with allure.step("Шаг без параметров 1"):
+                pass
+        finally:
+            allure_commons.plugin_manager.unregister(recorder)
+
+        assert [record["step"] for record in recorder.records] == [
+            "Шаг {number} из 10", "Шаг {number} из 10", "Шаг {number} из 10", "Шаг без параметров 1",
+        ]
@@ -3,15 +3,14 @@ UI-тесты для проверки авторизации и поиска ф
 Покрывает позитивные и негативные сценарии для разных вариантов входа и поиска.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import json
 
 import pytest
 import allure
 
 from pages.auth_page import AuthPage
 from pages.search_page import SearchPage
+from utils.consistency import queries_from_test_data, run_consistency
 
 @allure.feature("UI Авторизация")
 class TestAuthUI:
@@ -55,6 +54,21 @@ class TestAuthUI:
             f"Сообщение об ошибке '{expected_error}'"
         )
 
+    @allure.story("Повторное использование авторизации")
+    def test_auth_state_reused(self, logged_in_browser, config, test_data, auth_state_cache):
+        """
+        Проверка, что повторная авторизация выполняется из сохранённого состояния,
+        без входа через форму. Сравнивается изменение счётчика входов,
+        поэтому результат не зависит от тестов, выполненных раньше.
+        """
+        auth = AuthPage(logged_in_browser, config['ui']['base_url'])
+        assert auth.is_logged_in(), "Пользователь должен быть авторизован"
+        logins = auth_state_cache.logins
+        assert auth_state_cache.login(
+            logged_in_browser, test_data['valid_email'], test_data['valid_password']
+        ), "Не удалось авторизоваться повторно"
+        assert auth_state_cache.logins == logins, "Повторная авторизация не должна входить через форму"
+
 @allure.feature("UI Поиск фильмов")
 class TestSearchUI:
     """
@@ -101,3 +115,63 @@ class TestSearchUI:
         assert len(found_titles) == 0, (
             "Результаты должны быть пустыми для некорректного запроса"
         )
+
+def _found_titles(driver, base_url: str, query: str) -> list:
+    page = SearchPage(driver, base_url)
+    page.open()
+    page.search(query)
+    return page.get_found_titles()
+
+@allure.feature("Сверка сайта и API")
+class TestConsistencyUI:
+    """
+    Сверка результатов поиска на сайте с ответами API для набора запросов.
+    """
+
+    @allure.story("Поиск на сайте совпадает с поиском в API")
+    def test_search_ui_matches_api(self, request, config, test_data, kinopoisk_api,
+                                   ui_base_url, ui_waits):
+        """
+        Проверка, что доля запросов с расхождениями между сайтом и API не превышает
+        max_discrepancy_rate из секции [consistency]. Запросы — consistency_queries
+        тестовых данных; в режиме --browser-mode=contexts поиск на сайте идёт параллельно.
+        """
+        settings = config['consistency']
+        base_url = ui_base_url
+        if request.config.getoption('--browser-mode') == 'contexts':
+            pool = request.getfixturevalue('context_pool')
+            ui_workers = pool.size
+
+            def ui_search(query):
+                driver = pool.acquire()
+                try:
+                    return _found_titles(driver, base_url, query)
+                finally:
+                    pool.release(driver)
+        else:
+            browser = request.getfixturevalue('browser')
+            ui_workers = 1
+
+            def ui_search(query):
+                return _found_titles(browser, base_url, query)
+
+        api_limit = settings.getint('api_limit', 30)
+        report = run_consistency(
+            queries_from_test_data(test_data),
+            ui_search,
+            lambda query: kinopoisk_api.search_movie_records(query, limit=api_limit),
+            limit=settings.getint('limit', 10),
+            threshold=settings.getfloat('near_threshold', 0.6),
+            ui_workers=ui_workers,
+            api_workers=settings.getint('api_workers', 8),
+        )
+        allure.attach(report.format(), name="Расхождения сайта и API",
+                      attachment_type=allure.attachment_type.TEXT)
+        if settings.get('report_path'):
+            with open(settings['report_path'], 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f, ensure_ascii=False, indent=1)
+        max_rate = settings.getfloat('max_discrepancy_rate', 0.1)
+        assert report.discrepancy_rate <= max_rate, (
+            f"Доля запросов с расхождениями {report.discrepancy_rate:.0%} больше {max_rate:.0%}:\n"
+            + report.format(max_lines=20)
+        )
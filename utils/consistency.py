@@ -0,0 +1,242 @@
+"""
+Модуль сверки результатов поиска на сайте и в API Кинопоиска.
+
+Каждый запрос выполняется двумя путями: через страницу поиска (SearchPage)
+и через KinopoiskApi. Найденные на сайте названия сравниваются с фильмами API
+по ключам utils.titles: сначала точные совпадения ключей, затем близкие
+по индексу триграмм. Сравнение линейно по числу названий, поэтому сверка
+тысяч запросов за ночной прогон ограничена только скоростью самих запросов.
+
+Запросы API выполняются в пуле потоков параллельно с поиском на сайте.
+Итог — компактный отчёт: полностью совпавшие запросы только подсчитываются,
+для остальных перечисляются расхождения.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.titles import TitleIndex
+
+SEARCH_DATA_KEYS = ("search_exact", "search_partial", "search_en", "search_fake", "search_invalid")
+
+
+def queries_from_test_data(test_data: dict) -> list:
+    """
+    Возвращает запросы для сверки: список consistency_queries тестовых данных,
+    а если его нет — поисковые запросы позитивных и негативных сценариев.
+    Повторы удаляются с сохранением порядка.
+    """
+    queries = test_data.get("consistency_queries") or [test_data.get(key) for key in SEARCH_DATA_KEYS]
+    return list(dict.fromkeys(query for query in queries if query))
+
+
+def _display(movie) -> str:
+    return movie.name or movie.alternative_name or movie.en_name or f"#{movie.id}"
+
+
+class QueryDiff:
+    """
+    Результат сверки одного запроса.
+    """
+
+    __slots__ = ("query", "ui_count", "api_count", "matches", "near", "only_ui", "only_api", "error")
+
+    def __init__(self, query: str):
+        self.query = query
+        self.ui_count = 0
+        self.api_count = 0
+        self.matches = []
+        self.near = []
+        self.only_ui = []
+        self.only_api = []
+        self.error = None
+
+    @property
+    def status(self) -> str:
+        """
+        Итог сверки: error, mismatch (есть расхождения), near (только близкие совпадения) или match.
+        """
+        if self.error:
+            return "error"
+        if self.only_ui or self.only_api:
+            return "mismatch"
+        return "near" if self.near else "match"
+
+    def to_dict(self) -> dict:
+        data = {"query": self.query, "status": self.status,
+                "ui": self.ui_count, "api": self.api_count}
+        if self.near:
+            data["near"] = [[ui, api, round(score, 3)] for ui, api, score in self.near]
+        if self.only_ui:
+            data["only_ui"] = self.only_ui
+        if self.only_api:
+            data["only_api"] = self.only_api
+        if self.error:
+            data["error"] = self.error
+        return data
+
+    def format(self) -> str:
+        if self.error:
+            return f"! {self.query}: {self.error}"
+        parts = [f"{self.query} [сайт={self.ui_count} API={self.api_count}]"]
+        parts += [f"+сайт «{title}»" for title in self.only_ui]
+        parts += [f"+API «{title}»" for title in self.only_api]
+        parts += [f"~ «{ui}» ≈ «{api}» ({score:.2f})" for ui, api, score in self.near]
+        return "; ".join(parts)
+
+
+def compare_titles(query: str, ui_titles: list, movies: list,
+                   limit: int = 10, threshold: float = 0.6) -> QueryDiff:
+    """
+    Сопоставляет названия со страницы поиска с фильмами из ответа API.
+
+    Каждый фильм API сопоставляется не более чем одному названию сайта.
+    Фильмы API без пары считаются расхождением, только если они входят в первые
+    N результатов API, где N — число названий на сайте (или limit, если сайт
+    ничего не нашёл): более глубокие результаты сайт мог просто не показать.
+
+    Аргументы:
+        query (str): Поисковый запрос.
+        ui_titles (list[str]): Названия фильмов со страницы поиска.
+        movies (list[Movie]): Фильмы из ответа API.
+        limit (int): Сколько первых названий сайта сверять.
+        threshold (float): Минимальное сходство триграмм для близкого совпадения.
+
+    Возвращает:
+        QueryDiff: Совпадения и расхождения по запросу.
+    """
+    diff = QueryDiff(query)
+    ui_titles = ui_titles[:limit]
+    diff.ui_count = len(ui_titles)
+    diff.api_count = len(movies)
+    index = TitleIndex()
+    for movie in movies:
+        index.add(movie, movie.name, movie.alternative_name, movie.en_name)
+    used = set()
+    pending = []
+    for title in ui_titles:
+        number = next((n for n in index.exact(title) if n not in used), None)
+        if number is None:
+            pending.append(title)
+            continue
+        used.add(number)
+        diff.matches.append((title, _display(movies[number])))
+    for title in pending:
+        number, score = next(((n, s) for n, s in index.similar(title, threshold) if n not in used),
+                             (None, 0.0))
+        if number is None:
+            diff.only_ui.append(title)
+            continue
+        used.add(number)
+        diff.near.append((title, _display(movies[number]), score))
+    depth = min(len(ui_titles) or limit, len(movies))
+    diff.only_api = [_display(movies[n]) for n in range(depth) if n not in used]
+    return diff
+
+
+class ConsistencyReport:
+    """
+    Итоги сверки набора запросов.
+    """
+
+    def __init__(self):
+        self.diffs = []
+        self.elapsed = 0.0
+
+    def counts(self) -> dict:
+        """
+        Возвращает число запросов по статусам и число названий по видам совпадений.
+        """
+        counts = {"queries": len(self.diffs), "match": 0, "near": 0, "mismatch": 0, "error": 0,
+                  "titles_exact": 0, "titles_near": 0, "only_ui": 0, "only_api": 0}
+        for diff in self.diffs:
+            counts[diff.status] += 1
+            counts["titles_exact"] += len(diff.matches)
+            counts["titles_near"] += len(diff.near)
+            counts["only_ui"] += len(diff.only_ui)
+            counts["only_api"] += len(diff.only_api)
+        return counts
+
+    @property
+    def discrepancy_rate(self) -> float:
+        """
+        Доля запросов с расхождениями или ошибками.
+        """
+        counts = self.counts()
+        bad = counts["mismatch"] + counts["error"]
+        return bad / counts["queries"] if counts["queries"] else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Возвращает отчёт для JSON; совпавшие запросы в него не попадают.
+        """
+        return {
+            "summary": dict(self.counts(), elapsed_s=round(self.elapsed, 3)),
+            "queries": [diff.to_dict() for diff in self.diffs if diff.status != "match"],
+        }
+
+    def format(self, max_lines: int = 50) -> str:
+        """
+        Возвращает текстовый отчёт: сводку и строки запросов с расхождениями.
+
+        Аргументы:
+            max_lines (int): Максимальное число строк с запросами.
+        """
+        counts = self.counts()
+        lines = [
+            f"Запросов: {counts['queries']} за {self.elapsed:.1f} с — совпадают: {counts['match']}, "
+            f"близкие: {counts['near']}, расхождения: {counts['mismatch']}, ошибки: {counts['error']}",
+            f"Названий: точных {counts['titles_exact']}, близких {counts['titles_near']}, "
+            f"только на сайте {counts['only_ui']}, только в API {counts['only_api']}",
+        ]
+        order = {"error": 0, "mismatch": 1, "near": 2}
+        problems = sorted((diff for diff in self.diffs if diff.status != "match"),
+                          key=lambda diff: order[diff.status])
+        lines += [diff.format() for diff in problems[:max_lines]]
+        if len(problems) > max_lines:
+            lines.append(f"... и ещё {len(problems) - max_lines}")
+        return "\n".join(lines)
+
+
+def run_consistency(queries, ui_search, api_search, limit: int = 10, threshold: float = 0.6,
+                    ui_workers: int = 1, api_workers: int = 8) -> ConsistencyReport:
+    """
+    Выполняет запросы на сайте и в API и сверяет результаты.
+
+    Аргументы:
+        queries (Iterable[str]): Поисковые запросы.
+        ui_search (Callable[[str], list[str]]): Поиск на сайте, возвращающий названия фильмов.
+            При ui_workers > 1 функция должна быть потокобезопасной
+            (например, брать отдельный контекст браузера на каждый вызов).
+        api_search (Callable[[str], list[Movie]]): Поиск через API.
+        limit (int): Сколько первых названий сайта сверять.
+        threshold (float): Минимальное сходство триграмм для близкого совпадения.
+        ui_workers (int): Число потоков поиска на сайте.
+        api_workers (int): Число потоков запросов к API.
+
+    Возвращает:
+        ConsistencyReport: Итоги сверки в порядке запросов.
+    """
+    queries = list(dict.fromkeys(queries))
+    report = ConsistencyReport()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(api_workers, thread_name_prefix="consistency-api") as api_pool, \
+            ThreadPoolExecutor(ui_workers, thread_name_prefix="consistency-ui") as ui_pool:
+        api_futures = [api_pool.submit(api_search, query) for query in queries]
+        ui_futures = [ui_pool.submit(ui_search, query) for query in queries]
+        for query, ui_future, api_future in zip(queries, ui_futures, api_futures):
+            results = {}
+            errors = []
+            for side, future in (("сайт", ui_future), ("API", api_future)):
+                try:
+                    results[side] = future.result()
+                except Exception as e:
+                    errors.append(f"{side}: {type(e).__name__}: {e}")
+            if errors:
+                diff = QueryDiff(query)
+                diff.error = "; ".join(errors)
+            else:
+                diff = compare_titles(query, results["сайт"], results["API"], limit, threshold)
+            report.diffs.append(diff)
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,43 @@
+"""
+Модуль межпроцессной блокировки на основе lock-файла.
+
+Используется там, где несколько процессов (например, воркеры pytest-xdist)
+работают с общим файлом на диске.
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Захватывает эксклюзивную блокировку файла на время блока with.
+    Ожидает, пока блокировку не отпустит другой процесс.
+
+    Аргументы:
+        path (str): Путь к lock-файлу; создаётся при необходимости.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,131 @@
+"""
+Модуль нормализации названий фильмов и индекса для нечёткого сравнения.
+
+Названия на сайте и в API могут различаться регистром, буквой «ё», пунктуацией
+и алфавитом («Человек-паук» и «Chelovek pauk»). Поэтому сравниваются ключи:
+название приводится к нижнему регистру, «ё» заменяется на «е», пунктуация
+и пробелы убираются, кириллица транслитерируется в латиницу.
+Для близких, но не совпадающих ключей используется индекс по триграммам:
+кандидаты находятся по общим триграммам за время, пропорциональное длине названия,
+а не перебором всех пар названий.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+NGRAM = 3
+
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+})
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    Приводит название к нижнему регистру, заменяет «ё» на «е», убирает
+    диакритику и пунктуацию; слова разделяются одним пробелом.
+
+    Аргументы:
+        title (str): Название фильма.
+
+    Возвращает:
+        str: Нормализованное название.
+    """
+    text = unicodedata.normalize("NFKD", (title or "").casefold().replace("ё", "е"))
+    # Бреве сохраняется: после NFKD из него и «и» снова собирается «й».
+    text = "".join(char for char in text if not unicodedata.combining(char) or char == "\u0306")
+    return _NON_WORD.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def title_key(title: str) -> str:
+    """
+    Возвращает ключ сравнения: нормализованное и транслитерированное название без пробелов.
+    """
+    return normalize_title(title).translate(_TRANSLIT).replace(" ", "")
+
+
+def ngrams(key: str, n: int = NGRAM) -> Counter:
+    """
+    Возвращает n-граммы ключа; края дополняются, чтобы короткие ключи тоже имели n-граммы.
+    """
+    padded = f"{'^' * (n - 1)}{key}$"
+    return Counter(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+class TitleIndex:
+    """
+    Индекс названий: точные ключи и обратный индекс триграмм.
+
+    Каждое значение (например, фильм) может быть добавлено с несколькими названиями.
+    """
+
+    def __init__(self, n: int = NGRAM):
+        self.n = n
+        self.values = []
+        self._exact = {}
+        self._postings = {}
+        self._sizes = []
+
+    def add(self, value, *titles) -> int:
+        """
+        Добавляет значение с его названиями; пустые названия пропускаются.
+
+        Аргументы:
+            value: Значение, возвращаемое при поиске.
+            titles (str): Названия значения.
+
+        Возвращает:
+            int: Номер значения в индексе.
+        """
+        number = len(self.values)
+        self.values.append(value)
+        for title in titles:
+            key = title_key(title)
+            if not key:
+                continue
+            numbers = self._exact.setdefault(key, [])
+            if not numbers or numbers[-1] != number:
+                numbers.append(number)
+            grams = ngrams(key, self.n)
+            entry = len(self._sizes)
+            self._sizes.append((number, sum(grams.values())))
+            for gram, count in grams.items():
+                self._postings.setdefault(gram, []).append((entry, count))
+        return number
+
+    def exact(self, title: str) -> list:
+        """
+        Возвращает номера значений, у которых есть название с тем же ключом.
+        """
+        return self._exact.get(title_key(title), [])
+
+    def similar(self, title: str, threshold: float = 0.0) -> list:
+        """
+        Находит значения с похожими названиями по коэффициенту Дайса для триграмм.
+
+        Аргументы:
+            title (str): Название для поиска.
+            threshold (float): Минимальное сходство от 0 до 1.
+
+        Возвращает:
+            list: Пары (номер значения, сходство), самые похожие первыми.
+        """
+        grams = ngrams(title_key(title), self.n)
+        size = sum(grams.values())
+        shared = Counter()
+        for gram, count in grams.items():
+            for entry, entry_count in self._postings.get(gram, ()):
+                shared[entry] += min(count, entry_count)
+        best = {}
+        for entry, common in shared.items():
+            number, entry_size = self._sizes[entry]
+            score = 2 * common / (size + entry_size)
+            if score >= threshold and score > best.get(number, 0.0):
+                best[number] = score
+        return sorted(best.items(), key=lambda item: item[1], reverse=True)